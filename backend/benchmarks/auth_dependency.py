@@ -0,0 +1,44 @@
+"""
+Стоимость цепочки авторизации verify_author_role -> verify_token.
+
+Сравнивается полная проверка JWT на каждый вызов (кеш сбрасывается перед
+каждым запросом, как было до кеша) и путь через кеш проверенных токенов.
+
+Запуск из каталога backend:
+    python -m benchmarks.auth_dependency --calls 100000
+"""
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from utils.jwt_token import token_cache, verify_author_role
+from utils.security import TokenFactory
+
+
+async def run(calls: int, cached: bool) -> float:
+    user = SimpleNamespace(id=1, is_author=True, is_investor=False, is_admin=False)
+    credentials = HTTPAuthorizationCredentials(scheme='Bearer', credentials=TokenFactory().create_access_token(user))
+    token_cache.clear()
+    started = time.perf_counter()
+    for _ in range(calls):
+        if not cached:
+            token_cache.clear()
+        await verify_author_role(credentials)
+    return time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=100_000)
+    args = parser.parse_args()
+
+    for name, cached in (('decode', False), ('cached', True)):
+        elapsed = await run(args.calls, cached)
+        print(f'{name:>7}: {args.calls / elapsed:12.0f} calls/s {elapsed / args.calls * 1e6:8.2f} us/call')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
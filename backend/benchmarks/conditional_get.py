@@ -0,0 +1,68 @@
+"""
+Проверка условных запросов к кешируемым эндпоинтам.
+
+GET /projects/{pk} и GET /projects/{pk}/rewards отдают ETag; повтор с If-None-Match
+должен получить 304 и для точного тега, и для слабого W/"..." (так его пересылает
+nginx после gzip), и для списка тегов, и для *. Чужой тег получает 200 с телом.
+Скрипт вызывает эндпоинты через main.app (httpx.ASGITransport). При расхождении
+завершается с кодом 1.
+
+Запуск из каталога backend (нужна БД из DATABASE_URL и httpx):
+    python -m benchmarks.conditional_get
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+
+from benchmarks.fixtures import seed_reward
+from main import app
+from models.base import engine
+
+PROFILE = dict(name='bench', surname='bench', patronymic='bench', bank_number='0')
+
+
+async def main() -> int:
+    project_pk, _, _ = await seed_reward(quantity=1)
+    login_name, password = f'bench-etag-{time.time_ns()}', 'bench'
+    failures = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        response = await client.post('/auth/register', json=dict(PROFILE, login=login_name, password=password,
+                                                                 is_investor=True))
+        response.raise_for_status()
+        response = await client.post('/auth/login', json=dict(login=login_name, password=password))
+        response.raise_for_status()
+        auth = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        for url in (f'/projects/{project_pk}', f'/projects/{project_pk}/rewards'):
+            response = await client.get(url, headers=auth)
+            response.raise_for_status()
+            etag = response.headers['ETag']
+            cases = (
+                ('exact', etag, 304),
+                ('weak', f'W/{etag}', 304),
+                ('list', f'"other", W/{etag}', 304),
+                ('any', '*', 304),
+                ('other', '"other", W/"other"', 200),
+            )
+            for name, header, status in cases:
+                response = await client.get(url, headers={**auth, 'If-None-Match': header})
+                ok = response.status_code == status
+                print(f'{"ok" if ok else "FAIL":>4}  {url:<32} {name:<6} status={response.status_code} '
+                      f'(expected {status})')
+                if not ok:
+                    failures.append(f'{url} {name}')
+
+    await engine.dispose()
+    if failures:
+        print(f'FAILED: {", ".join(failures)}')
+        return 1
+    print('OK: conditional requests revalidate with strong and weak tags')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,42 @@
+"""
+Пропускная способность пакетной загрузки вкладов (POST /contrib/import).
+
+Запуск из каталога backend (нужна настроенная БД из DATABASE_URL):
+    python -m benchmarks.contrib_import --rows 10000 --batch 5000
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.fixtures import seed_reward
+from endpoints.contrib import import_contributions
+from models.base import async_session_maker
+from schemas.contrib import ContribImportItem
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--batch', type=int, default=5_000)
+    parser.add_argument('--investors', type=int, default=100)
+    args = parser.parse_args()
+
+    project_pk, reward_pk, investor_pks = await seed_reward(args.rows, investors=args.investors)
+    items = [
+        ContribImportItem(project_id=project_pk, reward_id=reward_pk, profile_id=investor_pks[i % len(investor_pks)])
+        for i in range(args.rows)
+    ]
+
+    created = 0
+    started = time.perf_counter()
+    for offset in range(0, len(items), args.batch):
+        async with async_session_maker() as db:
+            results = await import_contributions(items[offset:offset + args.batch], db=db, _token_payload={})
+        created += sum(result.id is not None for result in results)
+    elapsed = time.perf_counter() - started
+    print(f'rows={args.rows} batch={args.batch} created={created} elapsed={elapsed:.2f}s '
+          f'throughput={created / elapsed:.0f} rows/s')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,268 @@
+"""
+Сквозной бенчмарк API: main.app поднимается в этом же процессе (httpx.ASGITransport,
+без сети) поверх БД из DATABASE_URL, засеянной benchmarks.fixtures.seed_dataset.
+
+--concurrency виртуальных пользователей в течение --duration секунд выполняют
+взвешенную смесь запросов к auth, profile, projects и contrib. У каждого свой
+инвестор: refresh токены одноразовые, и общий пользователь гонялся бы за ними. По каждому
+эндпоинту выводятся пропускная способность, p50/p95/p99 и число ошибок.
+
+Результат пишется в --output (JSON) и сравнивается с --baseline: эндпоинт
+считается деградировавшим, если его p95 вырос или rps упал больше чем на
+--tolerance (эндпоинты, у которых меньше --min-requests запросов, не
+сравниваются). При деградации скрипт завершается с кодом 1. Если базовой линии
+еще нет (или указан --update-baseline), текущий результат становится ею.
+
+Запуск из каталога backend (нужен httpx):
+    python -m benchmarks.e2e --scale 10 --duration 30 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+from benchmarks.fixtures import BENCH_PASSWORD, SEARCH_WORDS, Dataset, seed_dataset
+from main import app
+
+DEFAULT_BASELINE = Path(__file__).with_name('e2e_baseline.json')
+DEFAULT_OUTPUT = Path(__file__).with_name('e2e_latest.json')
+
+
+@dataclass
+class User:
+    login: str
+    access_token: str
+    refresh_token: str
+
+    @property
+    def headers(self) -> dict:
+        return {'Authorization': f'Bearer {self.access_token}'}
+
+
+@dataclass
+class Context:
+    client: httpx.AsyncClient
+    dataset: Dataset
+    rnd: random.Random
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    async def call(self, name: str, method: str, url: str, ok=(200,), **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.latencies[name].append(time.perf_counter() - started)
+        if response.status_code not in ok:
+            self.errors[name] += 1
+        return response
+
+
+async def login(client: httpx.AsyncClient, login_name: str) -> User:
+    response = await client.post('/auth/login', json=dict(login=login_name, password=BENCH_PASSWORD))
+    response.raise_for_status()
+    tokens = response.json()
+    return User(login_name, tokens['access_token'], tokens['refresh_token'])
+
+
+# Сценарии: (вес, имя эндпоинта, функция). Веса примерно повторяют реальную нагрузку:
+# каталог и карточки проектов читают гораздо чаще, чем делают вклады и логинятся.
+
+async def projects_list(ctx: Context, user: User):
+    params = {'limit': 50}
+    if ctx.rnd.random() < 0.5:
+        params['status'] = 'accepted'
+    response = await ctx.call('GET /projects/', 'GET', '/projects/', params=params, headers=user.headers)
+    cursor = response.headers.get('X-Next-Cursor')
+    if cursor and ctx.rnd.random() < 0.3:
+        await ctx.call('GET /projects/ (next page)', 'GET', '/projects/',
+                       params={**params, 'cursor': cursor}, headers=user.headers)
+
+
+async def project_detail(ctx: Context, user: User):
+    pk = ctx.rnd.choice(ctx.dataset.project_ids)
+    await ctx.call('GET /projects/{pk}', 'GET', f'/projects/{pk}', headers=user.headers)
+
+
+async def project_rewards(ctx: Context, user: User):
+    pk = ctx.rnd.choice(ctx.dataset.project_ids)
+    await ctx.call('GET /projects/{pk}/rewards', 'GET', f'/projects/{pk}/rewards', headers=user.headers)
+
+
+async def project_search(ctx: Context, user: User):
+    q = ' '.join(ctx.rnd.sample(SEARCH_WORDS, 2))
+    await ctx.call('GET /projects/search', 'GET', '/projects/search', params={'q': q}, headers=user.headers)
+
+
+async def profile_me(ctx: Context, user: User):
+    await ctx.call('GET /profile/me', 'GET', '/profile/me', headers=user.headers)
+
+
+async def profile_update(ctx: Context, user: User):
+    data = dict(name='bench', surname='bench', patronymic='bench', bank_number=str(ctx.rnd.randrange(10 ** 9)))
+    await ctx.call('PUT /profile/me', 'PUT', '/profile/me', json=data, headers=user.headers)
+
+
+async def my_contributions(ctx: Context, user: User):
+    await ctx.call('GET /contrib/my', 'GET', '/contrib/my', params={'limit': 20}, headers=user.headers)
+
+
+async def contribution_stats(ctx: Context, user: User):
+    await ctx.call('GET /contrib/stats', 'GET', '/contrib/stats', headers=user.headers)
+
+
+async def make_contribution(ctx: Context, user: User):
+    project_pk, reward_pk = ctx.rnd.choice(ctx.dataset.rewards)
+    await ctx.call('POST /contrib/{project_pk}/rewards/{reward_pk}/contrib', 'POST',
+                   f'/contrib/{project_pk}/rewards/{reward_pk}/contrib', headers=user.headers)
+
+
+async def auth_login(ctx: Context, user: User):
+    await ctx.call('POST /auth/login', 'POST', '/auth/login', json=dict(login=user.login, password=BENCH_PASSWORD))
+
+
+async def auth_refresh(ctx: Context, user: User):
+    # Refresh токен одноразовый: пользователь продолжает с новой парой
+    response = await ctx.call('POST /auth/refresh', 'POST', '/auth/refresh',
+                              headers={'Authorization': f'Bearer {user.refresh_token}'})
+    if response.status_code == 200:
+        tokens = response.json()
+        user.access_token, user.refresh_token = tokens['access_token'], tokens['refresh_token']
+
+
+SCENARIOS = (
+    (25, projects_list),
+    (20, project_detail),
+    (15, project_rewards),
+    (5, project_search),
+    (10, profile_me),
+    (2, profile_update),
+    (8, my_contributions),
+    (5, contribution_stats),
+    (5, make_contribution),
+    (3, auth_login),
+    (2, auth_refresh),
+)
+
+
+async def virtual_user(ctx: Context, user: User, deadline: float):
+    weights = [weight for weight, _ in SCENARIOS]
+    scenarios = [scenario for _, scenario in SCENARIOS]
+    while time.perf_counter() < deadline:
+        scenario = ctx.rnd.choices(scenarios, weights)[0]
+        await scenario(ctx, user)
+
+
+def percentile(values: list[float], q: float) -> float:
+    index = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+def summarize(ctx: Context, elapsed: float) -> dict[str, dict]:
+    endpoints = {}
+    for name, latencies in sorted(ctx.latencies.items()):
+        latencies.sort()
+        endpoints[name] = dict(
+            requests=len(latencies),
+            errors=ctx.errors.get(name, 0),
+            rps=round(len(latencies) / elapsed, 2),
+            p50_ms=round(percentile(latencies, 50) * 1000, 3),
+            p95_ms=round(percentile(latencies, 95) * 1000, 3),
+            p99_ms=round(percentile(latencies, 99) * 1000, 3),
+        )
+    return endpoints
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_requests: int) -> list[str]:
+    regressions = []
+    for name, result in current['endpoints'].items():
+        base = baseline['endpoints'].get(name)
+        # По паре десятков запросов перцентили - шум, такие эндпоинты не сравниваются
+        if base is None or min(result['requests'], base['requests']) < min_requests:
+            continue
+        if result['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(f'{name}: p95 {base["p95_ms"]:.1f} -> {result["p95_ms"]:.1f} ms')
+        if result['rps'] < base['rps'] * (1 - tolerance):
+            regressions.append(f'{name}: rps {base["rps"]:.1f} -> {result["rps"]:.1f}')
+    return regressions
+
+
+def report(current: dict, baseline: dict | None):
+    header = f'{"endpoint":<56} {"req":>7} {"err":>5} {"rps":>8} {"p50":>8} {"p95":>8} {"p99":>8}'
+    print(header + ('  p95 vs base' if baseline else ''))
+    for name, result in current['endpoints'].items():
+        line = (f'{name:<56} {result["requests"]:>7} {result["errors"]:>5} {result["rps"]:>8.1f} '
+                f'{result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f} {result["p99_ms"]:>8.2f}')
+        base = baseline and baseline['endpoints'].get(name)
+        if base:
+            line += f'  {(result["p95_ms"] / base["p95_ms"] - 1) * 100:+6.1f}%'
+        print(line)
+    print(f'total: {current["total_requests"]} requests, {current["total_rps"]:.1f} req/s')
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--min-requests', type=int, default=100)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    dataset = await seed_dataset(args.scale, args.seed)
+    print(f'seeded scale={args.scale} in {time.perf_counter() - started:.1f}s')
+    if args.concurrency > len(dataset.investor_logins):
+        parser.error(f'--concurrency больше числа инвесторов ({len(dataset.investor_logins)}), увеличьте --scale')
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=60) as client:
+        users = await asyncio.gather(*(login(client, name) for name in dataset.investor_logins[:args.concurrency]))
+        ctx = Context(client, dataset, random.Random(args.seed))
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(virtual_user(ctx, user, deadline) for user in users))
+        elapsed = time.perf_counter() - started
+
+    endpoints = summarize(ctx, elapsed)
+    total = sum(result['requests'] for result in endpoints.values())
+    current = dict(
+        created_at=datetime.now().isoformat(timespec='seconds'),
+        config=dict(scale=args.scale, duration=args.duration, concurrency=args.concurrency,
+                    seed=args.seed, python=platform.python_version()),
+        total_requests=total,
+        total_rps=round(total / elapsed, 2),
+        endpoints=endpoints,
+    )
+    args.output.write_text(json.dumps(current, ensure_ascii=False, indent=2))
+
+    baseline = None
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get('config') != current['config']:
+            print(f'warning: baseline config {baseline.get("config")} differs from current run')
+    report(current, baseline)
+
+    if baseline is None:
+        args.baseline.write_text(json.dumps(current, ensure_ascii=False, indent=2))
+        print(f'baseline written to {args.baseline}')
+        return 0
+    regressions = compare(current, baseline, args.tolerance, args.min_requests)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
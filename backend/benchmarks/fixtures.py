@@ -0,0 +1,148 @@
+"""
+Общие заготовки данных для бенчмарков.
+"""
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, insert, select, update
+
+from models import Contribution, Profile, Project, Reward
+from models.base import async_session_maker
+from utils.security import hash_password
+
+
+def make_profile(prefix: str, **roles) -> Profile:
+    return Profile(
+        name='bench', surname='bench', patronymic='bench', bank_number='0',
+        login=f'{prefix}-{time.time_ns()}', hashed_password='-', **roles,
+    )
+
+
+async def seed_reward(quantity: int, investors: int = 1) -> tuple[int, int, list[int]]:
+    """
+    Создает автора, инвесторов, принятый проект и одну награду.
+    Возвращает (project_id, reward_id, [investor_id, ...]).
+    """
+    async with async_session_maker() as db:
+        author = make_profile('bench-author', is_author=True)
+        investor_profiles = [make_profile(f'bench-investor-{i}', is_investor=True) for i in range(investors)]
+        db.add_all([author, *investor_profiles])
+        await db.flush()
+        project = Project(author_id=author.id, title='bench', description='bench', goal_amount=1,
+                          project_type='bench', start_date=date.today(), end_date=date.today(), status='accepted')
+        db.add(project)
+        await db.flush()
+        reward = Reward(project_id=project.id, title='bench', description='bench', price=1,
+                        quantity=quantity, active=True)
+        db.add(reward)
+        await db.commit()
+        return project.id, reward.id, [investor.id for investor in investor_profiles]
+
+
+BENCH_PASSWORD = 'bench-password'
+SEARCH_WORDS = ('солнечная', 'электростанция', 'книга', 'игра', 'робот', 'сад', 'музыка', 'кино', 'школа', 'приют')
+
+
+@dataclass
+class Dataset:
+    """
+    Идентификаторы засеянных строк, из которых бенчмарк выбирает параметры запросов.
+    """
+    investor_logins: list[str]
+    author_logins: list[str]
+    project_ids: list[int]
+    rewards: list[tuple[int, int]] = field(default_factory=list)
+
+
+async def seed_dataset(scale: int = 1, seed: int = 0) -> Dataset:
+    """
+    Засевает БД набором в scale раз больше базового: 200 инвесторов, 20 авторов,
+    100 проектов по 3 награды и 1000 вкладов. Вставка пакетами, счетчики
+    проектов и наград пересчитываются в конце.
+    """
+    rnd = random.Random(seed)
+    run = time.time_ns()
+    hashed_password = await hash_password(BENCH_PASSWORD)
+    today = date.today()
+
+    def profiles(role: str, count: int) -> list[dict]:
+        return [
+            dict(name='bench', surname='bench', patronymic='bench', bank_number='0',
+                 login=f'bench-{run}-{role}-{i}', hashed_password=hashed_password, **{f'is_{role}': True})
+            for i in range(count)
+        ]
+
+    async with async_session_maker() as db:
+        investors = profiles('investor', 200 * scale)
+        authors = profiles('author', 20 * scale)
+        investor_ids = list((await db.scalars(insert(Profile).returning(Profile.id, sort_by_parameter_order=True), investors)).all())
+        author_ids = list((await db.scalars(insert(Profile).returning(Profile.id, sort_by_parameter_order=True), authors)).all())
+
+        projects = []
+        for i in range(100 * scale):
+            title = ' '.join(rnd.sample(SEARCH_WORDS, 2))
+            start_date = today - timedelta(days=rnd.randrange(365))
+            projects.append(dict(
+                author_id=rnd.choice(author_ids), title=f'{title} {i}', description=' '.join(rnd.choices(SEARCH_WORDS, k=20)),
+                goal_amount=rnd.choice((10_000, 50_000, 100_000)), project_type=rnd.choice(('tech', 'art', 'social')),
+                start_date=start_date, end_date=start_date + timedelta(days=90),
+                status=rnd.choices(('accepted', 'onModeration', 'draft'), weights=(7, 1, 2))[0],
+            ))
+        project_ids = list((await db.scalars(insert(Project).returning(Project.id, sort_by_parameter_order=True), projects)).all())
+
+        rewards = [
+            dict(project_id=project_id, title=f'Награда {n}', description='bench', price=price,
+                 quantity=1_000_000, active=True)
+            for project_id in project_ids
+            for n, price in enumerate((100, 500, 1000))
+        ]
+        reward_ids = list((await db.scalars(insert(Reward).returning(Reward.id, sort_by_parameter_order=True), rewards)).all())
+        reward_pairs = [(reward['project_id'], reward_id) for reward, reward_id in zip(rewards, reward_ids)]
+
+        contributions = []
+        for _ in range(1000 * scale):
+            project_id, reward_id = rnd.choice(reward_pairs)
+            contributions.append(dict(
+                project_id=project_id, reward_id=reward_id, profile_id=rnd.choice(investor_ids), status='paid',
+                created_at=datetime.now() - timedelta(minutes=rnd.randrange(60 * 24 * 90)),
+            ))
+        await db.execute(insert(Contribution), contributions)
+        await _recount(db, project_ids)
+        await db.commit()
+
+    return Dataset(
+        investor_logins=[profile['login'] for profile in investors],
+        author_logins=[profile['login'] for profile in authors],
+        project_ids=project_ids,
+        rewards=reward_pairs,
+    )
+
+
+async def _recount(db, project_ids: list[int]):
+    sold = (
+        select(Contribution.reward_id, func.count().label('sold_count'))
+        .where(Contribution.project_id.in_(project_ids))
+        .group_by(Contribution.reward_id)
+        .subquery()
+    )
+    await db.execute(
+        update(Reward).where(Reward.id == sold.c.reward_id)
+        .values(sold_count=sold.c.sold_count)
+    )
+    totals = (
+        select(
+            Contribution.project_id,
+            func.sum(Reward.price).label('raised_amount'),
+            func.count().label('contributions_count'),
+        )
+        .join(Reward, Reward.id == Contribution.reward_id)
+        .where(Contribution.project_id.in_(project_ids))
+        .group_by(Contribution.project_id)
+        .subquery()
+    )
+    await db.execute(
+        update(Project).where(Project.id == totals.c.project_id)
+        .values(raised_amount=totals.c.raised_amount, contributions_count=totals.c.contributions_count)
+    )
@@ -0,0 +1,256 @@
+"""
+Генератор больших синтетических наборов данных для нагрузочного тестирования:
+профили, проекты, награды и вклады со ссылочной целостностью.
+
+Распределения скошенные: популярность проектов и активность инвесторов
+подчиняются закону Ципфа (--skew), так что несколько "вирусных" проектов
+собирают большую часть вкладов, а остальные образуют длинный хвост.
+Вклады идут только в принятые проекты и попадают между их датами.
+
+Все строки сначала раскладываются в памяти (компактные array), затем пишутся
+через COPY одной транзакцией. Счетчики проектов и наград считаются заранее и
+пишутся вместе со строками, без UPDATE после вставки. Идентификаторы берутся
+блоком из последовательностей таблиц. На время генерации таблицы блокируются
+от параллельных вставок.
+
+Внешние ключи и вторичные индексы на время COPY снимаются и затем строятся
+заново по всей таблице (--keep-indexes отключает это). Это выгодно при заливке
+в пустую или небольшую БД; добавлять немного строк к уже большой таблице
+лучше с --keep-indexes.
+
+Запуск из каталога backend (нужна PostgreSQL БД из DATABASE_URL):
+    python -m benchmarks.generate_data --profiles 1000000 --projects 100000 --contributions 10000000
+"""
+import argparse
+import asyncio
+import bisect
+import itertools
+import random
+import time
+from array import array
+from datetime import date, datetime, time as dt_time, timedelta
+
+from sqlalchemy import Table
+
+from models import Contribution, Profile, Project, Reward
+from models.base import engine
+from utils.security import hash_password
+
+PROJECT_TYPES = ('tech', 'art', 'social', 'games', 'education', 'ecology')
+PROJECT_STATUSES = ('accepted', 'draft', 'onModeration', 'rejected')
+PROJECT_STATUS_WEIGHTS = (70, 15, 10, 5)
+WORDS = (
+    'солнечная', 'электростанция', 'книга', 'игра', 'робот', 'сад', 'музыка', 'кино', 'школа',
+    'приют', 'фестиваль', 'театр', 'велосипед', 'город', 'лес', 'river', 'open', 'source', 'game', 'art',
+)
+REWARD_PRICES = (100, 300, 500, 1000, 3000, 5000, 10000)
+
+
+def zipf_cum_weights(count: int, skew: float) -> list[float]:
+    return list(itertools.accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def zipf_sample(rnd: random.Random, cum_weights: list[float]) -> int:
+    return bisect.bisect(cum_weights, rnd.random() * cum_weights[-1])
+
+
+def copy_columns(table: Table) -> list[str]:
+    # Генерируемые БД столбцы (search_vector) COPY заполняет сам
+    return [column.name for column in table.columns if column.computed is None]
+
+
+class Generator:
+    def __init__(self, args: argparse.Namespace, hashed_password: str):
+        self.args = args
+        self.rnd = random.Random(args.seed)
+        self.hashed_password = hashed_password
+        self.run = time.time_ns()
+        self.today = date.today()
+
+    def plan(self):
+        """
+        Раскладывает проекты, награды и вклады по компактным массивам и
+        заранее считает денормализованные счетчики.
+        """
+        args, rnd = self.args, self.rnd
+        self.authors = max(1, int(args.profiles * args.authors_share))
+
+        self.project_status = array('b', rnd.choices(range(len(PROJECT_STATUSES)), PROJECT_STATUS_WEIGHTS, k=args.projects))
+        self.project_start = array('l', (
+            (self.today - timedelta(days=rnd.randrange(730))).toordinal() for _ in range(args.projects)
+        ))
+        self.project_days = array('h', (rnd.randrange(30, 180) for _ in range(args.projects)))
+
+        reward_counts = [rnd.randint(1, args.max_rewards) for _ in range(args.projects)]
+        self.reward_offset = array('l', itertools.accumulate(reward_counts, initial=0))
+        self.reward_price = array('l', (rnd.choice(REWARD_PRICES) for _ in range(self.reward_offset[-1])))
+        self.reward_sold = array('l', [0]) * self.reward_offset[-1]
+        self.project_raised = array('d', [0]) * args.projects
+        self.project_count = array('l', [0]) * args.projects
+
+        # Популярность: ранги Ципфа раздаются принятым проектам в случайном порядке
+        accepted = [i for i, status in enumerate(self.project_status) if status == 0]
+        rnd.shuffle(accepted)
+        self.contrib_reward = array('l')
+        self.contrib_investor = array('l')
+        if not accepted or args.contributions == 0:
+            return
+        investors = args.profiles - self.authors
+        project_weights = zipf_cum_weights(len(accepted), args.skew)
+        investor_weights = zipf_cum_weights(investors, args.investor_skew)
+        for _ in range(args.contributions):
+            project = accepted[zipf_sample(rnd, project_weights)]
+            reward = rnd.randrange(self.reward_offset[project], self.reward_offset[project + 1])
+            self.contrib_reward.append(reward)
+            self.contrib_investor.append(zipf_sample(rnd, investor_weights))
+            self.reward_sold[reward] += 1
+            self.project_raised[project] += self.reward_price[reward]
+            self.project_count[project] += 1
+
+    def profiles(self, first_id: int):
+        for i in range(self.args.profiles):
+            is_author = i < self.authors
+            yield (
+                first_id + i, f'Имя{i}', f'Фамилия{i}', f'Отчество{i}', f'{i:020d}', None,
+                False, is_author, not is_author, f'gen-{self.run}-{i}', self.hashed_password,
+            )
+
+    def projects(self, first_id: int, first_profile_id: int):
+        rnd = self.rnd
+        for i in range(self.args.projects):
+            start = date.fromordinal(self.project_start[i])
+            title = ' '.join(rnd.sample(WORDS, 3))
+            yield (
+                first_id + i, first_profile_id + rnd.randrange(self.authors), f'{title} {i}',
+                ' '.join(rnd.choices(WORDS, k=30)), float(rnd.choice((10_000, 50_000, 100_000, 1_000_000))),
+                rnd.choice(PROJECT_TYPES), start, start + timedelta(days=self.project_days[i]),
+                PROJECT_STATUSES[self.project_status[i]], None, self.project_raised[i], self.project_count[i],
+            )
+
+    def rewards(self, first_id: int, first_project_id: int):
+        rnd = self.rnd
+        for project in range(self.args.projects):
+            for reward in range(self.reward_offset[project], self.reward_offset[project + 1]):
+                sold = self.reward_sold[reward]
+                yield (
+                    first_id + reward, first_project_id + project, f'Награда {reward}', 'Описание награды',
+                    float(self.reward_price[reward]), max(sold, rnd.choice((10, 100, 1000, 100_000))), True, sold,
+                )
+
+    def contributions(self, first_id: int, first_project_id: int, first_reward_id: int, first_profile_id: int):
+        rnd = self.rnd
+        offsets = self.reward_offset
+        for i, reward in enumerate(self.contrib_reward):
+            project = bisect.bisect(offsets, reward) - 1
+            start = self.project_start[project]
+            days = min(self.project_days[project], self.today.toordinal() - start)
+            created_at = datetime.combine(date.fromordinal(start + rnd.randint(0, max(days, 0))), dt_time()) \
+                + timedelta(seconds=rnd.randrange(86400))
+            yield (
+                first_id + i, first_project_id + project, first_reward_id + reward,
+                first_profile_id + self.authors + self.contrib_investor[i], 'paid', created_at,
+            )
+
+
+async def reserve_ids(connection, table: Table, count: int) -> int:
+    """
+    Забирает из последовательности таблицы блок из count идентификаторов
+    и возвращает первый из них.
+    """
+    sequence = await connection.fetchval("SELECT pg_get_serial_sequence($1, 'id')", table.name)
+    first = await connection.fetchval('SELECT nextval($1)', sequence)
+    if count > 1:
+        await connection.execute('SELECT setval($1, $2)', sequence, first + count - 1)
+    return first
+
+
+async def drop_secondary(connection, table: Table) -> list[str]:
+    """
+    Снимает внешние ключи и вторичные индексы таблицы и возвращает DDL для их
+    восстановления: построить индекс и проверить ключ разом по всей таблице
+    намного быстрее, чем поддерживать их на каждой вставленной строке.
+    """
+    foreign_keys = await connection.fetch(
+        "SELECT conname, pg_get_constraintdef(oid) AS definition FROM pg_constraint "
+        "WHERE conrelid = $1::regclass AND contype = 'f'",
+        table.name,
+    )
+    indexes = await connection.fetch(
+        'SELECT i.indexrelid::regclass::text AS name, pg_get_indexdef(i.indexrelid) AS definition '
+        'FROM pg_index i WHERE i.indrelid = $1::regclass '
+        'AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)',
+        table.name,
+    )
+    for foreign_key in foreign_keys:
+        await connection.execute(f'ALTER TABLE {table.name} DROP CONSTRAINT {foreign_key["conname"]}')
+    for index in indexes:
+        await connection.execute(f'DROP INDEX {index["name"]}')
+    return [index['definition'] for index in indexes] + [
+        f'ALTER TABLE {table.name} ADD CONSTRAINT {foreign_key["conname"]} {foreign_key["definition"]}'
+        for foreign_key in foreign_keys
+    ]
+
+
+async def copy(connection, table: Table, records, count: int, rebuild: bool):
+    started = time.perf_counter()
+    restore = await drop_secondary(connection, table) if rebuild else []
+    await connection.copy_records_to_table(table.name, records=records, columns=copy_columns(table))
+    for statement in restore:
+        await connection.execute(statement)
+    elapsed = time.perf_counter() - started
+    print(f'{table.name:>14}: {count:>10} rows in {elapsed:7.1f}s ({count / max(elapsed, 1e-9):>10.0f} rows/s)')
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profiles', type=int, default=100_000)
+    parser.add_argument('--projects', type=int, default=10_000)
+    parser.add_argument('--contributions', type=int, default=1_000_000)
+    parser.add_argument('--authors-share', type=float, default=0.05, help='доля авторов среди профилей')
+    parser.add_argument('--max-rewards', type=int, default=5, help='наград на проект, от 1 до')
+    parser.add_argument('--skew', type=float, default=1.1, help='показатель Ципфа для популярности проектов')
+    parser.add_argument('--investor-skew', type=float, default=0.8, help='показатель Ципфа для активности инвесторов')
+    parser.add_argument('--password', default='password', help='пароль всех сгенерированных профилей')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep-indexes', action='store_true',
+                        help='не снимать внешние ключи и вторичные индексы на время COPY')
+    args = parser.parse_args()
+    if engine.dialect.name != 'postgresql':
+        parser.error('нужна PostgreSQL: данные пишутся через COPY')
+    if args.profiles - max(1, int(args.profiles * args.authors_share)) < 1:
+        parser.error('нужен хотя бы один инвестор')
+
+    total_started = time.perf_counter()
+    generator = Generator(args, await hash_password(args.password))
+    generator.plan()
+    print(f'planned in {time.perf_counter() - total_started:.1f}s')
+
+    rebuild = not args.keep_indexes
+    tables = [model.__table__ for model in (Profile, Project, Reward, Contribution)]
+    reward_count = generator.reward_offset[-1]
+    contribution_count = len(generator.contrib_reward)
+    async with engine.connect() as sa_connection:
+        connection = (await sa_connection.get_raw_connection()).driver_connection
+        async with connection.transaction():
+            for table in tables:
+                await connection.execute(f'LOCK TABLE {table.name} IN SHARE ROW EXCLUSIVE MODE')
+            profile_id = await reserve_ids(connection, Profile.__table__, args.profiles)
+            project_id = await reserve_ids(connection, Project.__table__, args.projects)
+            reward_id = await reserve_ids(connection, Reward.__table__, reward_count)
+            contribution_id = await reserve_ids(connection, Contribution.__table__, contribution_count)
+
+            await copy(connection, Profile.__table__, generator.profiles(profile_id), args.profiles, rebuild)
+            await copy(connection, Project.__table__, generator.projects(project_id, profile_id), args.projects, rebuild)
+            await copy(connection, Reward.__table__, generator.rewards(reward_id, project_id), reward_count, rebuild)
+            await copy(connection, Contribution.__table__,
+                       generator.contributions(contribution_id, project_id, reward_id, profile_id), contribution_count,
+                       rebuild)
+    await engine.dispose()
+
+    elapsed = time.perf_counter() - total_started
+    rows = args.profiles + args.projects + reward_count + contribution_count
+    print(f'{"total":>14}: {rows:>10} rows in {elapsed:7.1f}s ({rows / elapsed:>10.0f} rows/s)')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Сериализация больших списков: стандартный путь FastAPI против быстрого.
+
+- fastapi: валидация response_model from_attributes + jsonable_encoder + json.dumps;
+- adapter: ListSerializer - одна валидация TypeAdapter и dump_json в Rust;
+- orjson: rows_response - доверенные строки-проекции сразу через orjson.
+
+Запуск из каталога backend:
+    python -m benchmarks.list_serialization --rows 1000 10000
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from schemas.project import CreatedProjectData
+from utils.fast_json import ListSerializer, rows_response
+
+
+def make_rows(count: int) -> list[dict]:
+    return [
+        dict(
+            id=i, author_id=i % 100, title=f'Проект {i}', description='Описание проекта ' * 20,
+            goal_amount=100_000.0, project_type='tech', start_date=date(2025, 1, 1) + timedelta(days=i % 365),
+            end_date=date(2026, 1, 1), status='accepted', moderator_comment=None,
+            raised_amount=float(i), contributions_count=i % 50,
+        )
+        for i in range(count)
+    ]
+
+
+DEFAULT_ADAPTER = TypeAdapter(list[CreatedProjectData])
+
+
+def fastapi_default(objects):
+    validated = DEFAULT_ADAPTER.validate_python(objects, from_attributes=True)
+    return JSONResponse(jsonable_encoder(validated))
+
+
+def measure(func, payload, budget: float = 2.0) -> float:
+    func(payload)
+    calls, started = 0, time.perf_counter()
+    while time.perf_counter() - started < budget:
+        func(payload)
+        calls += 1
+    return calls / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000])
+    args = parser.parse_args()
+
+    serializer = ListSerializer(CreatedProjectData)
+    for count in args.rows:
+        rows = make_rows(count)
+        objects = [SimpleNamespace(**row) for row in rows]
+        results = {
+            'fastapi': measure(fastapi_default, objects),
+            'adapter': measure(serializer.response, objects),
+            'orjson': measure(rows_response, rows),
+        }
+        line = ' '.join(f'{name}={rps:8.1f} resp/s' for name, rps in results.items())
+        print(f'rows={count:>6} {line}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Задержка event loop во время потока логинов.
+
+Пока идет N параллельных проверок пароля, отдельная корутина каждые 5 мс
+"обрабатывает запрос" и замеряет, насколько позже запланированного она
+проснулась. Это та задержка, которую получают все остальные эндпоинты.
+
+Запуск из каталога backend:
+    python -m benchmarks.login_storm --logins 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from utils.security import pwd_context, verify_password, password_hash_metrics
+
+TICK = 0.005
+
+
+async def probe(stop: asyncio.Event, lags: list[float]):
+    while not stop.is_set():
+        planned = time.perf_counter() + TICK
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - planned)
+
+
+async def blocking_verify(password, hashed):
+    return pwd_context.verify(password, hashed)
+
+
+async def storm(verify, logins: int, hashed: str) -> list[float]:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    probe_task = asyncio.create_task(probe(stop, lags))
+    await asyncio.gather(*(verify('password', hashed) for _ in range(logins)))
+    stop.set()
+    await probe_task
+    return lags
+
+
+def report(name: str, lags: list[float]):
+    lags = sorted(lags)
+    p50 = statistics.median(lags)
+    p99 = lags[int(len(lags) * 0.99) - 1] if len(lags) > 1 else lags[0]
+    print(f'{name:>10}: samples={len(lags):>5} p50={p50 * 1000:8.2f} ms p99={p99 * 1000:8.2f} ms max={lags[-1] * 1000:8.2f} ms')
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logins', type=int, default=100)
+    args = parser.parse_args()
+
+    hashed = pwd_context.hash('password')
+    report('blocking', await storm(blocking_verify, args.logins, hashed))
+    report('pool', await storm(verify_password, args.logins, hashed))
+    print('pool metrics:', password_hash_metrics.snapshot())
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+Стресс-проверка резервирования наград в make_contribution.
+
+Создает автора, инвестора, проект и награду на --quantity единиц, затем
+параллельно вызывает make_contribution --requests раз, каждый раз в своей
+сессии. Награда не должна быть продана больше quantity раз.
+
+Запуск из каталога backend (нужна настроенная БД из DATABASE_URL):
+    python -m benchmarks.reward_oversell --requests 2000 --quantity 100
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from benchmarks.fixtures import seed_reward
+from endpoints.contrib import make_contribution
+from models import Contribution, Reward
+from models.base import async_session_maker
+
+
+async def contribute(project_pk: int, reward_pk: int, investor_pk: int) -> int:
+    async with async_session_maker() as db:
+        try:
+            await make_contribution(project_pk, reward_pk, db=db, token_payload={'sub': str(investor_pk)})
+        except HTTPException as exc:
+            return exc.status_code
+        return 200
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--quantity', type=int, default=100)
+    args = parser.parse_args()
+
+    project_pk, reward_pk, (investor_pk,) = await seed_reward(args.quantity)
+    started = time.perf_counter()
+    statuses = await asyncio.gather(*(
+        contribute(project_pk, reward_pk, investor_pk) for _ in range(args.requests)
+    ))
+    elapsed = time.perf_counter() - started
+
+    async with async_session_maker() as db:
+        sold_count = (await db.execute(select(Reward.sold_count).where(Reward.id == reward_pk))).scalar_one()
+        stored = (await db.execute(
+            select(func.count(Contribution.id)).where(Contribution.reward_id == reward_pk)
+        )).scalar_one()
+
+    accepted = statuses.count(200)
+    print(f'requests={args.requests} quantity={args.quantity} accepted={accepted} '
+          f'rejected={statuses.count(409)} elapsed={elapsed:.2f}s')
+    print(f'sold_count={sold_count} contributions={stored}')
+    assert accepted == sold_count == stored <= args.quantity, 'reward oversold'
+    print('OK: reward was not oversold')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+Проверка числа SQL-запросов на пишущих эндпоинтах.
+
+Каждый пишущий обработчик при успехе выполняет один INSERT/UPDATE ... RETURNING
+и коммит, без повторного SELECT после него. Регистрация дополнительно проверяет
+занятость логина до bcrypt, а повторная регистрация занятого логина обходится
+одним этим запросом. Скрипт вызывает эндпоинты через main.app
+(httpx.ASGITransport) и считает запросы событием движка; коммит в счет не входит.
+При расхождении завершается с кодом 1.
+
+Запуск из каталога backend (нужна БД из DATABASE_URL и httpx):
+    python -m benchmarks.write_statements
+"""
+import asyncio
+import sys
+import time
+from datetime import date
+
+import httpx
+from sqlalchemy import event
+
+from benchmarks.fixtures import seed_reward
+from main import app
+from models.base import engine
+
+PROFILE = dict(name='bench', surname='bench', patronymic='bench', bank_number='0')
+PROJECT = dict(title='bench', description='bench', goal_amount=1, project_type='bench',
+               start_date=date.today().isoformat(), end_date=date.today().isoformat())
+REWARD = dict(title='bench', description='bench', price=1, quantity=10)
+
+statements = 0
+
+
+@event.listens_for(engine.sync_engine, 'before_cursor_execute')
+def count_statement(*_args):
+    global statements
+    statements += 1
+
+
+class Checker:
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.failures = []
+
+    async def check(self, name: str, expected: int, method: str, url: str, status: int = 200, **kwargs) -> dict:
+        global statements
+        statements = 0
+        response = await self.client.request(method, url, **kwargs)
+        ok = response.status_code == status and statements == expected
+        print(f'{"ok" if ok else "FAIL":>4}  {name:<40} status={response.status_code} statements={statements} '
+              f'(expected {status}, {expected})')
+        if not ok:
+            self.failures.append(name)
+        return response.json()
+
+
+async def login(client: httpx.AsyncClient, login_name: str, password: str) -> dict:
+    response = await client.post('/auth/login', json=dict(login=login_name, password=password))
+    response.raise_for_status()
+    return {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+
+async def main() -> int:
+    project_pk, reward_pk, _ = await seed_reward(quantity=10)
+    author_login, investor_login, password = f'bench-author-{time.time_ns()}', f'bench-investor-{time.time_ns()}', 'bench'
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        checker = Checker(client)
+        await checker.check('POST /auth/register', 2, 'POST', '/auth/register', status=201,
+                            json=dict(PROFILE, login=author_login, password=password, is_author=True))
+        await checker.check('POST /auth/register (login taken)', 1, 'POST', '/auth/register', status=400,
+                            json=dict(PROFILE, login=author_login, password=password, is_author=True))
+        await checker.check('POST /auth/register (investor)', 2, 'POST', '/auth/register', status=201,
+                            json=dict(PROFILE, login=investor_login, password=password, is_investor=True))
+        author = await login(client, author_login, password)
+        investor = await login(client, investor_login, password)
+
+        await checker.check('PUT /profile/me', 1, 'PUT', '/profile/me', json=PROFILE, headers=author)
+        project = await checker.check('POST /projects/', 1, 'POST', '/projects/', json=PROJECT, headers=author)
+        await checker.check('PUT /projects/{pk}', 1, 'PUT', f'/projects/{project["id"]}',
+                            json=PROJECT, headers=author)
+        reward = await checker.check('POST /projects/{pk}/rewards', 1, 'POST', f'/projects/{project["id"]}/rewards',
+                                     json=REWARD, headers=author)
+        await checker.check('PATCH /projects/{pk}/rewards/{pk}', 1, 'PATCH',
+                            f'/projects/{project["id"]}/rewards/{reward["id"]}', json=REWARD, headers=author)
+        await checker.check('POST /contrib/{pk}/rewards/{pk}/contrib', 1, 'POST',
+                            f'/contrib/{project_pk}/rewards/{reward_pk}/contrib', headers=investor)
+
+    await engine.dispose()
+    if checker.failures:
+        print(f'FAILED: {", ".join(checker.failures)}')
+        return 1
+    print('OK: every write endpoint stays within its statement budget')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
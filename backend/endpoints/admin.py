@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+from datetime import date
+from enum import Enum
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from models import Contribution, Project, Reward
+from models.base import engine, async_session_maker
+from utils.jwt_token import verify_admin_role
+from utils.slow_queries import slow_query_stats
+
+admin_router = APIRouter(
+    tags=['Администрирование'],
+    dependencies=[Depends(verify_admin_role)],
+)
+
+
+@admin_router.get('/db/pool')
+async def get_pool_stats() -> dict:
+    """
+    Текущее состояние пула соединений с БД. Доступно только администратору.
+    """
+    return engine.pool.stats()
+
+
+class SlowQueryOrder(str, Enum):
+    total_ms = 'total_ms'
+    max_ms = 'max_ms'
+    avg_ms = 'avg_ms'
+    count = 'count'
+
+
+@admin_router.get('/db/slow-queries')
+async def get_slow_queries(
+        limit: int = Query(20, ge=1, le=500),
+        order_by: SlowQueryOrder = SlowQueryOrder.total_ms,
+) -> list[dict]:
+    """
+    Самые тяжелые медленные запросы этого процесса, сгруппированные по отпечатку.
+    Доступно только администратору.
+    """
+    return slow_query_stats.top(limit, order_by.value)
+
+
+@admin_router.delete('/db/slow-queries', status_code=204)
+async def reset_slow_queries():
+    slow_query_stats.clear()
+
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = {
+    'contributions': [
+        Contribution.id, Contribution.project_id, Contribution.reward_id, Contribution.profile_id,
+        Contribution.status, Contribution.created_at,
+    ],
+    'projects': [
+        Project.id, Project.author_id, Project.title, Project.description, Project.goal_amount,
+        Project.project_type, Project.start_date, Project.end_date, Project.status, Project.moderator_comment,
+        Project.raised_amount, Project.contributions_count,
+    ],
+    'rewards': [
+        Reward.id, Reward.project_id, Reward.title, Reward.description, Reward.price, Reward.quantity,
+        Reward.active, Reward.sold_count,
+    ],
+}
+
+
+class ExportEntity(str, Enum):
+    contributions = 'contributions'
+    projects = 'projects'
+    rewards = 'rewards'
+
+
+class ExportFormat(str, Enum):
+    ndjson = 'ndjson'
+    csv = 'csv'
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'Unsupported value: {value!r}')
+
+
+async def _stream_rows(entity: ExportEntity, export_format: ExportFormat) -> AsyncIterator[str]:
+    columns = EXPORT_COLUMNS[entity.value]
+    names = [column.key for column in columns]
+    stmt = (
+        select(*columns)
+        .order_by(columns[0])
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if export_format is ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+        yield buffer.getvalue()
+    # Сессия открывается внутри генератора: она должна жить, пока идет отдача ответа,
+    # а серверный курсор держит в памяти только одну пачку строк.
+    async with async_session_maker() as session:
+        result = await session.stream(stmt)
+        async for partition in result.partitions():
+            if export_format is ExportFormat.csv:
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(partition)
+                yield buffer.getvalue()
+            else:
+                yield ''.join(
+                    json.dumps(dict(zip(names, row)), default=_json_default, ensure_ascii=False) + '\n'
+                    for row in partition
+                )
+
+
+@admin_router.get('/export/{entity}')
+async def export_entity(
+        entity: ExportEntity,
+        export_format: ExportFormat = ExportFormat.ndjson,
+) -> StreamingResponse:
+    """
+    Потоковая выгрузка вкладов, проектов или наград в NDJSON или CSV.
+    Доступно только администратору.
+    """
+    media_type = 'text/csv' if export_format is ExportFormat.csv else 'application/x-ndjson'
+    return StreamingResponse(
+        _stream_rows(entity, export_format),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="{entity.value}.{export_format.value}"'},
+    )
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from http import HTTPStatus
 
 import pydantic
@@ -5,15 +6,20 @@ from fastapi import (
     Depends,
     HTTPException, APIRouter,
 )
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import (
     Profile,
+    RevokedRefreshToken,
     get_db,
 )
+from settings import settings
 from schemas.profile import ProfileCreateData, ProfileReadData
 from utils.jwt_token import verify_token, verify_refresh_token
+from utils.revocation import revoked_refresh_tokens
 from utils.security import hash_password, verify_password, TokenFactory
 
 auth_router = APIRouter(
@@ -37,16 +43,20 @@ async def register(
         user: ProfileCreateData,
         db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(Profile).where(Profile.login == user.login).limit(1)
-    existing_user: Profile | None = (await db.execute(stmt)).scalar_one_or_none()
-    if existing_user:
+    # Занятый логин отсекается до bcrypt: иначе каждая повторная регистрация
+    # стоила бы полного раунда хеширования
+    if await db.scalar(select(exists().where(Profile.login == user.login))):
         raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='Login already registered')
     user_dict = user.model_dump()
     user_dict.pop('password')
-    new_user = Profile(**user_dict, hashed_password=hash_password(user.password))
-    db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)
+    stmt = insert(Profile).values(**user_dict, hashed_password=await hash_password(user.password)).returning(Profile)
+    # Логин могли занять параллельно, пока считался хеш: это ловит уникальный индекс
+    try:
+        new_user = await db.scalar(stmt)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='Login already registered')
     return new_user
 
 
@@ -62,7 +72,7 @@ async def login(
 ) -> dict[str, str]:
     stmt = select(Profile).where(Profile.login == credentials.login).limit(1)
     user: Profile | None = (await db.execute(stmt)).scalar_one_or_none()
-    if not (user and verify_password(credentials.password, user.hashed_password)):
+    if not (user and await verify_password(credentials.password, user.hashed_password)):
         raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail='Invalid credentials')
 
     access_token, refresh_token = TokenFactory().create_pair(user)
@@ -74,12 +84,64 @@ async def login(
     )
 
 
+_rotations = 0
+
+
+def _utcnow() -> datetime:
+    # exp в токене - UTC, так же хранится и expires_at
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def _purge_expired_revocations(db: AsyncSession):
+    global _rotations
+    _rotations += 1
+    if _rotations % settings.REVOKED_TOKENS_PURGE_EVERY == 0:
+        await db.execute(delete(RevokedRefreshToken).where(RevokedRefreshToken.expires_at < _utcnow()))
+        await db.commit()
+
+
 @auth_router.post('/refresh')
 async def refresh(
         token_payload: dict = Depends(verify_refresh_token),
         db: AsyncSession = Depends(get_db),
 ) -> dict[str, str]:
-    user = await get_user(token_payload=token_payload, db=db)
+    """
+    Обмен refresh токена на новую пару. Каждый refresh токен одноразовый.
+    """
+    jti = token_payload.get('jti')
+    if not jti:
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail='Invalid refresh token')
+    # Фильтр в памяти отвечает "точно не отозван" без похода в БД;
+    # на "возможно отозван" ответ подтверждается по таблице
+    if jti in revoked_refresh_tokens and await db.get(RevokedRefreshToken, jti) is not None:
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail='Refresh token already used')
+
+    # Отзыв токена и загрузка пользователя - один запрос. Вставка без конфликта
+    # возможна только один раз, поэтому из двух параллельных обменов одного
+    # токена (в том числе в разных процессах) пройдет только один.
+    revoked = (
+        pg_insert(RevokedRefreshToken)
+        .values(jti=jti, expires_at=datetime.fromtimestamp(token_payload['exp'], timezone.utc).replace(tzinfo=None))
+        .on_conflict_do_nothing()
+        .returning(RevokedRefreshToken.jti)
+        .cte('revoked')
+    )
+    stmt = (
+        select(Profile)
+        .where(Profile.id == int(token_payload['sub']), exists(select(revoked.c.jti)))
+        .add_cte(revoked)
+    )
+    user: Profile | None = await db.scalar(stmt)
+    if user is None:
+        await db.rollback()
+        if await db.get(Profile, int(token_payload['sub'])) is None:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='User not found')
+        revoked_refresh_tokens.add(jti)
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail='Refresh token already used')
+    await db.commit()
+    revoked_refresh_tokens.add(jti)
+    await _purge_expired_revocations(db)
+
     access_token, refresh_token = TokenFactory().create_pair(user)
     return dict(
         access_token=access_token,
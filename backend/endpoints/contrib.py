@@ -1,20 +1,34 @@
+from collections import Counter, defaultdict
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
-from sqlalchemy import select, func
+from sqlalchemy import select, update, insert, bindparam, literal, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from models import get_db, Contribution
+from models import get_db, get_read_db, Contribution, PlatformStats, Profile
 from models.project import Reward, Project
-from schemas.contrib import ContribSchema, DetailedContribSchema
-from utils.jwt_token import verify_investor_role
+from schemas.contrib import ContribSchema, DetailedContribSchema, ContribImportItem, ContribImportResult
+from utils.jwt_token import verify_investor_role, verify_admin_role
+from utils.fast_json import schema_columns, rows_response
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, set_next_cursor
+from utils.response_cache import response_cache, project_key, rewards_key
 
 contrib_router = APIRouter(
     tags=['Взносы'],
 )
 
+MAX_IMPORT_BATCH = 10_000
+
+MY_CONTRIB_PROJECT_COLUMNS = {
+    name: getattr(Project, name).label(f'project_{name}')
+    for name in ('id', 'title', 'project_type', 'status', 'goal_amount', 'raised_amount')
+}
+MY_CONTRIB_REWARD_COLUMNS = {
+    name: getattr(Reward, name).label(f'reward_{name}')
+    for name in ('id', 'title', 'description', 'price', 'quantity', 'active', 'sold_count')
+}
+
 
 @contrib_router.post('/{project_pk}/rewards/{reward_pk}/contrib', response_model=ContribSchema)
 async def make_contribution(
@@ -23,97 +37,210 @@ async def make_contribution(
         db: AsyncSession = Depends(get_db),
         token_payload: dict = Depends(verify_investor_role),
 ):
-    project = await db.get(Project, project_pk)
     # todo: возможно жертвовать только при определенном статусе
-    reward = await db.get(Reward, reward_pk)
-    if not reward or reward.project_id != project_pk:
-        raise HTTPException(status_code=404)
-    profile_contrib = Contribution(
-        project_id=project_pk,
-        reward_id=reward_pk,
-        profile_id=int(token_payload['sub']),
-        status='Новый',
-        created_at=datetime.now(),
+    # Резерв награды, обновление счетчиков проекта и вставка вклада - один запрос
+    # с data-modifying CTE. Условный UPDATE награды не дает двум параллельным
+    # транзакциям продать больше quantity. UPDATE счетчиков держит блокировку
+    # строки проекта до коммита, так что вклады в один проект все же идут по
+    # очереди; окно - один запрос и коммит, без чтений между ними.
+    reserved = (
+        update(Reward)
+        .where(
+            Reward.id == reward_pk,
+            Reward.project_id == project_pk,
+            Reward.active.is_(True),
+            Reward.sold_count < Reward.quantity,
+        )
+        .values(sold_count=Reward.sold_count + 1)
+        .returning(Reward.id, Reward.project_id, Reward.price)
+        .cte('reserved')
+    )
+    counters = (
+        update(Project)
+        .where(Project.id == reserved.c.project_id)
+        .values(
+            raised_amount=Project.raised_amount + reserved.c.price,
+            contributions_count=Project.contributions_count + 1,
+        )
+        .returning(Project.id)
+        .cte('counters')
     )
-    db.add(profile_contrib)
+    stmt = (
+        insert(Contribution)
+        .from_select(
+            ['project_id', 'reward_id', 'profile_id', 'status', 'created_at'],
+            select(
+                reserved.c.project_id,
+                reserved.c.id,
+                literal(int(token_payload['sub'])),
+                literal('Новый', Contribution.status.type),
+                literal(datetime.now(), Contribution.created_at.type),
+            ),
+        )
+        .returning(Contribution)
+        .add_cte(counters)
+    )
+    profile_contrib = await db.scalar(stmt)
+    if profile_contrib is None:
+        reward = await db.get(Reward, reward_pk)
+        if not reward or reward.project_id != project_pk:
+            raise HTTPException(status_code=404)
+        raise HTTPException(status_code=409, detail='Награда недоступна или закончилась.')
     await db.commit()
-    await db.refresh(profile_contrib)
+    response_cache.invalidate(project_key(project_pk), rewards_key(project_pk))
     return profile_contrib
 
 
+@contrib_router.post('/import', response_model=list[ContribImportResult])
+async def import_contributions(
+        items: list[ContribImportItem] = Body(max_length=MAX_IMPORT_BATCH),
+        db: AsyncSession = Depends(get_db),
+        _token_payload: dict = Depends(verify_admin_role),
+):
+    """
+    Пакетная загрузка вкладов из офлайн-каналов и платежных реестров партнеров.
+    Доступно только администратору. Возвращает результат по каждой строке.
+    """
+    reward_ids = {item.reward_id for item in items}
+    profile_ids = {item.profile_id for item in items}
+    # Награды блокируются на время загрузки, чтобы остатки не ушли в минус
+    rewards = {
+        row.id: row
+        for row in (await db.execute(
+            select(Reward.id, Reward.project_id, Reward.price, Reward.active, Reward.quantity, Reward.sold_count)
+            .where(Reward.id.in_(reward_ids))
+            .order_by(Reward.id)
+            .with_for_update()
+        )).all()
+    }
+    known_profiles = set((await db.execute(select(Profile.id).where(Profile.id.in_(profile_ids)))).scalars())
+
+    results = [ContribImportResult(index=index) for index in range(len(items))]
+    rows, row_indexes = [], []
+    reserved = Counter()
+    now = datetime.now()
+    for index, item in enumerate(items):
+        reward = rewards.get(item.reward_id)
+        if reward is None or reward.project_id != item.project_id:
+            results[index].error = 'Награда не найдена'
+        elif item.profile_id not in known_profiles:
+            results[index].error = 'Профиль не найден'
+        elif not reward.active or reward.sold_count + reserved[reward.id] >= reward.quantity:
+            results[index].error = 'Награда недоступна или закончилась'
+        else:
+            reserved[reward.id] += 1
+            rows.append(dict(item.model_dump(), created_at=item.created_at or now))
+            row_indexes.append(index)
+
+    if rows:
+        # insertmanyvalues собирает строки в многострочные INSERT ... RETURNING
+        created_ids = (await db.execute(
+            insert(Contribution).returning(Contribution.id, sort_by_parameter_order=True),
+            rows,
+        )).scalars().all()
+        for index, contrib_id in zip(row_indexes, created_ids):
+            results[index].id = contrib_id
+
+        raised = defaultdict(float)
+        counts = Counter()
+        for reward_id, count in reserved.items():
+            reward = rewards[reward_id]
+            raised[reward.project_id] += reward.price * count
+            counts[reward.project_id] += count
+        rewards_table, projects_table = Reward.__table__, Project.__table__
+        await db.execute(
+            rewards_table.update()
+            .where(rewards_table.c.id == bindparam('reward_id'))
+            .values(sold_count=rewards_table.c.sold_count + bindparam('count')),
+            [dict(reward_id=reward_id, count=count) for reward_id, count in sorted(reserved.items())],
+        )
+        await db.execute(
+            projects_table.update()
+            .where(projects_table.c.id == bindparam('project_id'))
+            .values(
+                raised_amount=projects_table.c.raised_amount + bindparam('amount'),
+                contributions_count=projects_table.c.contributions_count + bindparam('count'),
+            ),
+            [dict(project_id=project_id, amount=raised[project_id], count=counts[project_id]) for project_id in sorted(counts)],
+        )
+    await db.commit()
+    project_ids = {rewards[reward_id].project_id for reward_id in reserved}
+    response_cache.invalidate(*map(project_key, project_ids), *map(rewards_key, project_ids))
+    return results
+
+
 @contrib_router.get('/{project_pk}/rewards/{reward_pk}/contrib', response_model=list[ContribSchema])
 async def get_contributions(
         project_pk: int,
         reward_pk: int,
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
 ):
-    project = await db.get(Project, project_pk)
     reward = await db.get(Reward, reward_pk)
-    if reward.project_id != project_pk:
+    if not reward or reward.project_id != project_pk:
         raise HTTPException(status_code=404)
 
-    stmt = select(Contribution).where(Contribution.reward_id == reward_pk)
-    contribs = (await db.execute(stmt)).scalars().all()
-    return contribs
+    stmt = select(*schema_columns(Contribution, ContribSchema)).where(Contribution.reward_id == reward_pk)
+    rows = (await db.execute(stmt)).mappings().all()
+    return rows_response(rows)
 
 
 @contrib_router.get('/my', response_model=list[DetailedContribSchema])
 async def get_my_contributions(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: AsyncSession = Depends(get_db),
     token_payload: dict = Depends(verify_investor_role),
 ):
     """
-    Просмотреть свои вклады. Доступно только инвестору.
+    Просмотреть свои вклады, от новых к старым. Доступно только инвестору.
+    Вклад, награда и краткие сведения о проекте выбираются одним запросом;
+    курсор следующей страницы возвращается в заголовке X-Next-Cursor.
     """
     stmt = (
-        select(Contribution)
-        .where(Contribution.profile_id == int(token_payload['sub']))
-        .options(
-            selectinload(Contribution.reward),
-            selectinload(Contribution.project),
+        select(
+            Contribution.id, Contribution.project_id, Contribution.reward_id, Contribution.profile_id,
+            Contribution.status, Contribution.created_at,
+            *MY_CONTRIB_PROJECT_COLUMNS.values(),
+            *MY_CONTRIB_REWARD_COLUMNS.values(),
         )
+        .join(Reward, Reward.id == Contribution.reward_id)
+        .join(Project, Project.id == Contribution.project_id)
+        .where(Contribution.profile_id == int(token_payload['sub']))
     )
-
-    results = (await db.execute(stmt)).scalars().all()
-    return results
+    if cursor is not None:
+        last_created_at, last_id = decode_cursor(cursor, datetime, int)
+        stmt = stmt.where(tuple_(Contribution.created_at, Contribution.id) < (last_created_at, last_id))
+    stmt = stmt.order_by(Contribution.created_at.desc(), Contribution.id.desc()).limit(limit + 1)
+
+    rows = (await db.execute(stmt)).mappings().all()
+    rows = set_next_cursor(response, rows, limit, key=lambda row: (row['created_at'], row['id']))
+    return [
+        dict(
+            row,
+            project={name: row[label.key] for name, label in MY_CONTRIB_PROJECT_COLUMNS.items()},
+            reward={name: row[label.key] for name, label in MY_CONTRIB_REWARD_COLUMNS.items()},
+        )
+        for row in rows
+    ]
 
 
 class ContribStats(BaseModel):
     total_count: int
     total_amount: float
     cool_projects: int
+    refreshed_at: datetime
 
-@contrib_router.get('/stats')
+
+@contrib_router.get('/stats', response_model=ContribStats)
 async def get_contribution_stats(
-        db: AsyncSession = Depends(get_db)
+        db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Общая статистика по вкладам
+    Общая статистика по вкладам. Отдается из снимка, который фоновая задача
+    держит не старше STATS_MAX_STALENESS_SECONDS.
     """
-    stmt = select(
-        func.count(Contribution.id).label("total_count"),
-        func.sum(Reward.price).label("total_amount")
-    ).join(Contribution.reward)
-
-    result = await db.execute(stmt)
-    stats = result.one()
-
-    stmt = (
-        select(
-            Project.id,
-            Project.title,
-            Project.goal_amount,
-            func.coalesce(func.sum(Reward.price), 0).label("total_raised")
-        )
-        .outerjoin(Contribution, Project.id == Contribution.project_id)
-        .outerjoin(Reward, Contribution.reward_id == Reward.id)
-        .group_by(Project.id)
-    )
-
-    cool_projects = 0
-    result = (await db.execute(stmt)).all()
-    for project_id, project_title, goal_amount, total in result:
-        if total >= goal_amount:
-            cool_projects += 1
-
-    return ContribStats(total_count=stats[0] or 0, total_amount=stats[1] or 0, cool_projects=cool_projects)
+    snapshot = await db.get(PlatformStats, 1)
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail='Статистика еще не посчитана.')
+    return snapshot
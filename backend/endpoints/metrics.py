@@ -0,0 +1,61 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from models.base import engine
+from utils.metrics import Counter, Gauge, PROMETHEUS_CONTENT_TYPE, metrics
+from utils.security import password_hash_metrics
+
+metrics_router = APIRouter(
+    tags=['Метрики'],
+)
+
+pool_connections = metrics.add(Gauge(
+    'db_pool_connections', 'Соединения пула БД по состояниям.', ('state',),
+))
+pool_checkouts = metrics.add(Counter(
+    'db_pool_checkouts_total', 'Выдачи соединений из пула с момента старта.',
+))
+pool_wait = metrics.add(Counter(
+    'db_pool_wait_seconds_total', 'Суммарное ожидание свободного соединения.',
+))
+
+password_hash_tasks = metrics.add(Gauge(
+    'password_hash_tasks', 'Задачи пула хеширования паролей по состояниям.', ('state',),
+))
+password_hash_completed = metrics.add(Counter(
+    'password_hash_completed_total', 'Завершенные задачи пула хеширования паролей.',
+))
+password_hash_queue_wait = metrics.add(Counter(
+    'password_hash_queue_wait_seconds_total', 'Суммарное ожидание задач в очереди пула хеширования.',
+))
+password_hash_queue_wait_max = metrics.add(Gauge(
+    'password_hash_queue_wait_max_seconds', 'Наибольшее ожидание задачи в очереди пула хеширования.',
+))
+
+
+@metrics.collector
+def collect_pool_stats():
+    stats = engine.pool.stats()
+    pool_connections.set('checked_in', value=stats['checked_in'])
+    pool_connections.set('checked_out', value=stats['checked_out'])
+    pool_connections.set('overflow', value=stats['overflow'])
+    pool_checkouts.set(value=stats['checkouts'])
+    pool_wait.set(value=stats['wait_total'])
+
+
+@metrics.collector
+def collect_password_hash_stats():
+    stats = password_hash_metrics.snapshot()
+    password_hash_tasks.set('pending', value=stats['pending'])
+    password_hash_tasks.set('in_flight', value=stats['in_flight'])
+    password_hash_completed.set(value=stats['completed'])
+    password_hash_queue_wait.set(value=stats['queue_wait_total'])
+    password_hash_queue_wait_max.set(value=stats['queue_wait_max'])
+
+
+@metrics_router.get('/metrics', include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Метрики процесса в текстовом формате Prometheus.
+    """
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
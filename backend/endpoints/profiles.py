@@ -1,30 +1,66 @@
-from typing import Sequence
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import not_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import Profile, get_db
+from models import Profile, get_db, get_read_db
 from schemas.profile import ProfileReadData, BaseProfileData
+from utils.fast_json import schema_columns, rows_response
 from utils.jwt_token import verify_admin_role, verify_token
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, set_next_cursor
 
 profile_router = APIRouter(
     tags=['Profile'],
 )
 
 
+def _prefix_upper_bound(prefix: str) -> str | None:
+    # Наименьшая строка, которая больше всех строк с этим префиксом (в порядке байтов).
+    # U+10FFFF увеличить нельзя - увеличивается предыдущий символ; суррогаты
+    # не кодируются в UTF-8 и пропускаются. None - верхней границы нет.
+    prefix = prefix.rstrip(chr(0x10FFFF))
+    if not prefix:
+        return None
+    last = ord(prefix[-1]) + 1
+    if 0xD800 <= last <= 0xDFFF:
+        last = 0xE000
+    return prefix[:-1] + chr(last)
+
+
 @profile_router.get('/', response_model=list[ProfileReadData])
 async def get_profiles(
-        db: AsyncSession = Depends(get_db),
+        response: Response,
+        is_admin: bool | None = None,
+        is_author: bool | None = None,
+        is_investor: bool | None = None,
+        login_prefix: str | None = Query(None, min_length=1, max_length=255, pattern=r'^[^\x00]*$'),
+        cursor: str | None = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        db: AsyncSession = Depends(get_read_db),
         _token_payload: dict = Depends(verify_admin_role),
-) -> Sequence[Profile]:
+) -> Response:
     """
-    Список всех сотрудников (в том числе и уже уволенных).
-    Доступно только администратору.
+    Список всех сотрудников (в том числе и уже уволенных) постранично в порядке id,
+    с фильтрами по ролям и префиксу логина. Доступно только администратору.
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor.
     """
-    stmt = select(Profile)
-    results = (await db.execute(stmt)).scalars().all()
-    return results
+    stmt = select(*schema_columns(Profile, ProfileReadData))
+    for column, value in ((Profile.is_admin, is_admin), (Profile.is_author, is_author),
+                          (Profile.is_investor, is_investor)):
+        # Условие без параметра, чтобы совпасть с предикатом частичного индекса
+        if value is not None:
+            stmt = stmt.where(column if value else not_(column))
+    if login_prefix is not None:
+        stmt = stmt.where(Profile.login.op('~>=~')(login_prefix))
+        upper_bound = _prefix_upper_bound(login_prefix)
+        if upper_bound is not None:
+            stmt = stmt.where(Profile.login.op('~<~')(upper_bound))
+    if cursor is not None:
+        last_id, = decode_cursor(cursor, int)
+        stmt = stmt.where(Profile.id > last_id)
+    stmt = stmt.order_by(Profile.id).limit(limit + 1)
+    rows = (await db.execute(stmt)).mappings().all()
+    rows = set_next_cursor(response, rows, limit, key=lambda row: (row['id'],))
+    return rows_response(rows, headers=dict(response.headers))
 
 
 @profile_router.get('/me', response_model=ProfileReadData)
@@ -48,16 +84,9 @@ async def update_me(
         token_payload: dict = Depends(verify_token),
 ):
     pk = int(token_payload['sub'])
-    stmt = select(Profile).where(Profile.id == pk)
-    profile = (await db.execute(stmt)).scalars().first()
+    stmt = update(Profile).where(Profile.id == pk).values(**data.model_dump()).returning(Profile)
+    profile = await db.scalar(stmt)
     if not profile:
         raise HTTPException(status_code=404, detail='Profile not found')
-    profile.name = data.name
-    profile.surname = data.surname
-    profile.patronymic = data.patronymic
-    profile.bank_number = data.bank_number
-    profile.phone_number = data.phone_number
-    db.add(profile)
     await db.commit()
-    await db.refresh(profile)
     return profile
@@ -1,19 +1,39 @@
-from typing import Sequence
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+import asyncio
+from collections import Counter
+from datetime import date
+
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_, func, literal, update, case, insert
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import get_db, Project
-from models.project import Reward
-from schemas.project import CreatedProjectData, BaseProjectData
+from models import get_db, get_read_db, Project
+from models.project import Reward, PROJECT_SEARCH_CONFIGS
+from schemas.project import (
+    CreatedProjectData,
+    BaseProjectData,
+    ModerationDecision,
+    ModerationDecisionItem,
+    ModerationBatchResult,
+)
 from schemas.reward import RewardData, BaseRewardData
 from utils.jwt_token import verify_token, verify_author_role, verify_admin_role
+from utils.fast_json import schema_columns, rows_response, ListSerializer
+from utils.progress_events import progress_broker
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, set_next_cursor
+from utils.response_cache import response_cache, project_key, rewards_key
+from utils.project_transitions import PROJECT_TRANSITIONS, apply_transition
 
 project_router = APIRouter(
     tags=['Проекты'],
 )
 
+project_list_serializer = ListSerializer(CreatedProjectData)
+
+PROGRESS_HEARTBEAT_SECONDS = 15
+
 
 async def verify_project_by_author(project, author_id):
     if not project:
@@ -23,13 +43,137 @@ async def verify_project_by_author(project, author_id):
 
 @project_router.get('/', response_model=list[CreatedProjectData])
 async def get_projects(
-        db: AsyncSession = Depends(get_db),
+        response: Response,
+        status: str | None = None,
+        project_type: str | None = None,
+        author_id: int | None = None,
+        start_date_from: date | None = None,
+        start_date_to: date | None = None,
+        end_date_from: date | None = None,
+        end_date_to: date | None = None,
+        cursor: str | None = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        db: AsyncSession = Depends(get_read_db),
         _token_payload: dict = Depends(verify_token)
-) -> Sequence[Project]:
-    stmt = select(Project)
-    results = await db.execute(stmt)
-    projects = results.scalars().all()
-    return projects
+) -> Response:
+    """
+    Список проектов постранично, в порядке (status, start_date, id).
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor.
+    """
+    stmt = select(*schema_columns(Project, CreatedProjectData))
+    if status is not None:
+        stmt = stmt.where(Project.status == status)
+    if project_type is not None:
+        stmt = stmt.where(Project.project_type == project_type)
+    if author_id is not None:
+        stmt = stmt.where(Project.author_id == author_id)
+    if start_date_from is not None:
+        stmt = stmt.where(Project.start_date >= start_date_from)
+    if start_date_to is not None:
+        stmt = stmt.where(Project.start_date <= start_date_to)
+    if end_date_from is not None:
+        stmt = stmt.where(Project.end_date >= end_date_from)
+    if end_date_to is not None:
+        stmt = stmt.where(Project.end_date <= end_date_to)
+    if cursor is not None:
+        last_status, last_start_date, last_id = decode_cursor(cursor, str, date, int)
+        stmt = stmt.where(
+            tuple_(Project.status, Project.start_date, Project.id) > (last_status, last_start_date, last_id)
+        )
+    stmt = stmt.order_by(Project.status, Project.start_date, Project.id).limit(limit + 1)
+    rows = (await db.execute(stmt)).mappings().all()
+    rows = set_next_cursor(response, rows, limit, key=lambda row: (row['status'], row['start_date'], row['id']))
+    return rows_response(rows, headers=dict(response.headers))
+
+
+@project_router.get('/search', response_model=list[CreatedProjectData])
+async def search_projects(
+        q: str = Query(min_length=1, max_length=200),
+        status: str | None = None,
+        limit: int = Query(20, ge=1, le=100),
+        db: AsyncSession = Depends(get_db),
+        _token_payload: dict = Depends(verify_token),
+) -> Response:
+    """
+    Полнотекстовый поиск по названию и описанию проекта (русская и английская
+    морфология), отсортированный по релевантности.
+    """
+    query = None
+    for config in PROJECT_SEARCH_CONFIGS:
+        config_query = func.websearch_to_tsquery(literal(config).cast(REGCONFIG), q)
+        query = config_query if query is None else query.op('||')(config_query)
+    rank = func.ts_rank_cd(Project.search_vector, query)
+    stmt = select(Project).where(Project.search_vector.op('@@')(query))
+    if status is not None:
+        stmt = stmt.where(Project.status == status)
+    stmt = stmt.order_by(rank.desc(), Project.id).limit(limit)
+    return project_list_serializer.response((await db.execute(stmt)).scalars().all())
+
+
+@project_router.get('/moderation', response_model=list[CreatedProjectData])
+async def get_moderation_queue(
+        response: Response,
+        cursor: str | None = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        db: AsyncSession = Depends(get_db),
+        _token_payload: dict = Depends(verify_admin_role),
+) -> Response:
+    """
+    Очередь проектов на модерации в порядке id. Доступно администратору.
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor.
+    """
+    stmt = select(Project).where(Project.status == 'onModeration')
+    if cursor is not None:
+        last_id, = decode_cursor(cursor, int)
+        stmt = stmt.where(Project.id > last_id)
+    stmt = stmt.order_by(Project.id).limit(limit + 1)
+    projects = (await db.execute(stmt)).scalars().all()
+    projects = set_next_cursor(response, projects, limit, key=lambda p: (p.id,))
+    return project_list_serializer.response(projects, headers=dict(response.headers))
+
+
+@project_router.post('/moderation/decisions', response_model=ModerationBatchResult)
+async def apply_moderation_decisions(
+        decisions: list[ModerationDecisionItem] = Body(max_length=MAX_PAGE_SIZE),
+        db: AsyncSession = Depends(get_db),
+        _token_payload: dict = Depends(verify_admin_role),
+):
+    """
+    Пакетное решение по проектам на модерации. Доступно администратору.
+    Для каждого типа решения выполняется один UPDATE ... RETURNING;
+    проекты, которые уже не на модерации, возвращаются в skipped.
+    Проект может встречаться в пакете только один раз.
+    """
+    duplicates = sorted(pk for pk, count in Counter(item.project_id for item in decisions).items() if count > 1)
+    if duplicates:
+        raise HTTPException(
+            status_code=422,
+            detail=f'Несколько решений по одному проекту: {", ".join(map(str, duplicates))}.',
+        )
+
+    messages_by_decision: dict[ModerationDecision, dict[int, str]] = {}
+    for item in decisions:
+        messages_by_decision.setdefault(item.decision, {})[item.project_id] = item.message
+
+    applied = []
+    for decision, messages in messages_by_decision.items():
+        transition = PROJECT_TRANSITIONS[decision.value]
+        stmt = (
+            update(Project)
+            .where(Project.id.in_(messages), Project.status.in_(transition.source))
+            .values(
+                status=transition.target,
+                moderator_comment=case(messages, value=Project.id),
+            )
+            .returning(Project)
+        )
+        applied.extend((await db.execute(stmt)).scalars().all())
+    await db.commit()
+
+    applied_ids = {project.id for project in applied}
+    response_cache.invalidate(*map(project_key, applied_ids))
+    skipped = sorted({item.project_id for item in decisions} - applied_ids)
+    return dict(applied=applied, skipped=skipped)
 
 
 @project_router.post('/', response_model=CreatedProjectData)
@@ -41,14 +185,12 @@ async def create_project(
     """
     Создание проекта. Только для авторов.
     """
-    project = Project(
-        author_id=int(token_payload['sub']),
-        status='draft',
-        **project_data.model_dump(),
+    project = await db.scalar(
+        insert(Project)
+        .values(author_id=int(token_payload['sub']), status='draft', **project_data.model_dump())
+        .returning(Project)
     )
-    db.add(project)
     await db.commit()
-    await db.refresh(project)
     return project
 
 
@@ -61,12 +203,9 @@ async def delete_project(
     """
     Удалить проект. Доступно только автору на стадии черновика либо согласования.
     """
-    project = await db.get(Project, pk)
-    await verify_project_by_author(project, token_payload['sub'])
-    if project.status not in {'draft', 'onModeration'}:
-        raise HTTPException(status_code=403, detail='Проект на данной стадии удалить уже нельзя.')
-    await db.delete(project)
+    await apply_transition(db, 'delete', pk, author_id=int(token_payload['sub']))
     await db.commit()
+    response_cache.invalidate(project_key(pk))
     return None
 
 
@@ -82,15 +221,9 @@ async def submit_project(
     """
     Отправить проект на модерацию. Доступно только автору на стадии черновика.
     """
-    project = await db.get(Project, pk)
-    await verify_project_by_author(project, token_payload['sub'])
-
-    if project.status != 'draft':
-        raise HTTPException(status_code=403, detail='Проект нельзя перевести на модерацию.')
-    project.status = 'onModeration'
-    db.add(project)
+    project = await apply_transition(db, 'submit', pk, author_id=int(token_payload['sub']))
     await db.commit()
-    await db.refresh(project)
+    response_cache.invalidate(project_key(pk))
     return project
 
 
@@ -107,15 +240,9 @@ async def reject_project(
     """
     Отказать проекту. Доступно администратору.
     """
-    project = await db.get(Project, pk)
-
-    if project.status != 'onModeration':
-        raise HTTPException(status_code=403, detail='Проекту нельзя, так как он не находится на модерации.')
-    project.status = 'rejected'
-    project.moderator_comment = message
-    db.add(project)
+    project = await apply_transition(db, 'reject', pk, moderator_comment=message)
     await db.commit()
-    await db.refresh(project)
+    response_cache.invalidate(project_key(pk))
     return project
 
 
@@ -132,15 +259,9 @@ async def accept_project(
     """
     Подтвердить проект. Доступно администратору.
     """
-    project = await db.get(Project, pk)
-
-    if project.status != 'onModeration':
-        raise HTTPException(status_code=403, detail='Проект нельзя подтвердить, так как он не находится на модерации.')
-    project.status = 'accepted'
-    project.moderator_comment = message
-    db.add(project)
+    project = await apply_transition(db, 'accept', pk, moderator_comment=message)
     await db.commit()
-    await db.refresh(project)
+    response_cache.invalidate(project_key(pk))
     return project
 
 
@@ -157,28 +278,93 @@ async def to_draft_project(
     """
     Отправить на доработку проект. Доступно администратору.
     """
-    project = await db.get(Project, pk)
-
-    if project.status != 'onModeration':
-        raise HTTPException(status_code=403, detail='Проект нельзя отправить на доработку, так как он не находится на модерации.')
-    project.status = 'draft'
-    project.moderator_comment = message
-    db.add(project)
+    project = await apply_transition(db, 'to_draft', pk, moderator_comment=message)
     await db.commit()
-    await db.refresh(project)
+    response_cache.invalidate(project_key(pk))
     return project
 
 
 @project_router.get('/{pk}', response_model=CreatedProjectData)
 async def get_project(
         pk: int,
+        request: Request,
         db: AsyncSession = Depends(get_db),
         _token_payload: dict = Depends(verify_token),
 ):
-    project = await db.get(Project, pk)
-    if not project:
-        raise HTTPException(status_code=404, detail='Проект не найден.')
-    return project
+    """
+    Проект по id. Ответ кешируется в памяти и отдается с ETag.
+    Промах кеша читается с мастера: отстающая реплика положила бы в кеш
+    ответ до записи, которая его только что сбросила, на весь TTL.
+    """
+    cached = response_cache.get(project_key(pk))
+    if cached is None:
+        version = response_cache.version(project_key(pk))
+        project = await db.get(Project, pk)
+        if not project:
+            raise HTTPException(status_code=404, detail='Проект не найден.')
+        body = CreatedProjectData.model_validate(project, from_attributes=True).model_dump_json().encode()
+        cached = response_cache.put(project_key(pk), body, version)
+    return cached.to_response(request)
+
+def _sse_event(data: dict) -> bytes:
+    return b'event: progress\ndata: ' + orjson.dumps(data) + b'\n\n'
+
+
+@project_router.get('/{pk}/progress/stream')
+async def stream_project_progress(
+        pk: int,
+        db: AsyncSession = Depends(get_db),
+        _token_payload: dict = Depends(verify_token),
+) -> StreamingResponse:
+    """
+    Server-Sent Events с прогрессом сбора по проекту: сначала текущее состояние,
+    затем событие на каждый вклад. Медленный клиент получает только последнее
+    состояние, промежуточные события для него схлопываются. Если брокер потерял
+    LISTEN-соединение, поток завершается: клиент переподключится и получит
+    свежее состояние.
+    """
+    # Подписка до чтения снимка: вклад, закоммиченный между ними, не потеряется
+    queue = await progress_broker.subscribe(pk)
+    stmt = select(
+        Project.id.label('project_id'),
+        Project.raised_amount,
+        Project.contributions_count,
+        Project.goal_amount,
+    ).where(Project.id == pk)
+    try:
+        snapshot = (await db.execute(stmt)).mappings().one_or_none()
+        if snapshot is None:
+            raise HTTPException(status_code=404, detail='Проект не найден.')
+    except BaseException:
+        progress_broker.unsubscribe(pk, queue)
+        raise
+
+    async def events():
+        sent_count = snapshot['contributions_count']
+        try:
+            yield _sse_event(dict(snapshot))
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=PROGRESS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b': ping\n\n'
+                    continue
+                if event is None:
+                    return
+                # Событие, пришедшее до чтения снимка, уже учтено в нем
+                if event['contributions_count'] <= sent_count:
+                    continue
+                sent_count = event['contributions_count']
+                yield _sse_event(event)
+        finally:
+            progress_broker.unsubscribe(pk, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
 
 @project_router.put('/{pk}', status_code=200, response_model=CreatedProjectData)
 async def update_project(
@@ -187,36 +373,39 @@ async def update_project(
         db: AsyncSession = Depends(get_db),
         token_payload: dict = Depends(verify_author_role),
 ):
-    project = await db.get(Project, pk)
-    await verify_project_by_author(project, token_payload['sub'])
-
-    if project.status != 'draft':
+    author_id = int(token_payload['sub'])
+    project = await db.scalar(
+        update(Project)
+        .where(Project.id == pk, Project.author_id == author_id, Project.status == 'draft')
+        .values(**data.model_dump())
+        .returning(Project)
+    )
+    if project is None:
+        await verify_project_by_author(await db.get(Project, pk), author_id)
         raise HTTPException(status_code=403, detail='Проект редактировать уже нельзя.')
-
-    project.title = data.title
-    project.description = data.description
-    project.goal_amount = data.goal_amount
-    project.project_type = data.project_type
-    project.start_date = data.start_date
-    project.end_date = data.end_date
-    db.add(project)
     await db.commit()
-    await db.refresh(project)
+    response_cache.invalidate(project_key(pk))
     return project
 
 
 @project_router.get('/{project_pk}/rewards', response_model=list[RewardData])
 async def get_rewards(
         project_pk: int,
+        request: Request,
         db: AsyncSession = Depends(get_db),
 ):
     """
-    Просмотреть список наград.
+    Просмотреть список наград. Ответ кешируется в памяти и отдается с ETag.
+    Промах кеша, как и у проекта, читается с мастера.
     """
-    stmt = select(Reward).where(Reward.project_id == project_pk)
-    results = await db.execute(stmt)
-    rewards = results.scalars().all()
-    return rewards
+    cached = response_cache.get(rewards_key(project_pk))
+    if cached is None:
+        version = response_cache.version(rewards_key(project_pk))
+        stmt = select(*schema_columns(Reward, RewardData)).where(Reward.project_id == project_pk)
+        rows = (await db.execute(stmt)).mappings().all()
+        body = orjson.dumps([dict(row) for row in rows])
+        cached = response_cache.put(rewards_key(project_pk), body, version)
+    return cached.to_response(request)
 
 
 @project_router.post('/{project_pk}/rewards', response_model=RewardData)
@@ -226,17 +415,22 @@ async def create_reward(
         db: AsyncSession = Depends(get_db),
         token_payload: dict = Depends(verify_author_role),
 ):
-    project = await db.get(Project, project_pk)
-    await verify_project_by_author(project, token_payload['sub'])
-
-    reward = Reward(
-        project_id=project_pk,
-        active=True,
-        **reward_data.model_dump(),
+    author_id = int(token_payload['sub'])
+    values = dict(project_id=project_pk, active=True, **reward_data.model_dump())
+    # Награда вставляется только если проект принадлежит автору: проверка и вставка - один запрос
+    reward = await db.scalar(
+        insert(Reward)
+        .from_select(
+            list(values),
+            select(*(literal(value, Reward.__table__.c[name].type) for name, value in values.items()))
+            .where(Project.id == project_pk, Project.author_id == author_id),
+        )
+        .returning(Reward)
     )
-    db.add(reward)
+    if reward is None:
+        await verify_project_by_author(await db.get(Project, project_pk), author_id)
     await db.commit()
-    await db.refresh(reward)
+    response_cache.invalidate(rewards_key(project_pk))
     return reward
 
 
@@ -261,6 +455,7 @@ async def delete_reward(
         raise HTTPException(status_code=404, detail='Награда не найдена')
     await db.delete(reward)
     await db.commit()
+    response_cache.invalidate(rewards_key(project_pk))
     return None
 
 @project_router.patch('/{project_pk}/rewards/{pk}', status_code=200, response_model=RewardData)
@@ -271,16 +466,21 @@ async def update_reward(
         db: AsyncSession = Depends(get_db),
         token_payload: dict = Depends(verify_author_role),
 ):
-    project = await db.get(Project, project_pk)
-    await verify_project_by_author(project, token_payload['sub'])
-    reward = await db.get(Reward, pk)
-    if not reward or reward.project_id != project_pk:
-        raise HTTPException(status_code=404, detail='Награда не найдена')
-
-    db_reward_data = RewardData(**reward.__dict__)
+    author_id = int(token_payload['sub'])
     update_data = reward_data.model_dump(exclude_unset=True)
-    updated = db_reward_data.model_copy(update=update_data)
-    db.add(updated)
+    reward = await db.scalar(
+        update(Reward)
+        .where(
+            Reward.id == pk,
+            Reward.project_id == project_pk,
+            select(Project.id).where(Project.id == project_pk, Project.author_id == author_id).exists(),
+        )
+        .values(**update_data)
+        .returning(Reward)
+    )
+    if reward is None:
+        await verify_project_by_author(await db.get(Project, project_pk), author_id)
+        raise HTTPException(status_code=404, detail='Награда не найдена')
     await db.commit()
-    await db.refresh(updated)
-    return updated
+    response_cache.invalidate(rewards_key(project_pk))
+    return reward
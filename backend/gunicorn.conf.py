@@ -0,0 +1,30 @@
+"""
+Конфигурация многопроцессного запуска: gunicorn управляет процессами,
+каждый воркер - отдельный uvicorn event loop со своим пулом соединений.
+
+    gunicorn main:app -c gunicorn.conf.py
+
+Плавный перезапуск воркеров без потери запросов: kill -HUP <pid мастера>.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = 'uvicorn_worker.UvicornWorker'
+
+# Приложение асинхронное, поэтому по одному воркеру на ядро, а не 2n+1
+workers = int(os.getenv('WEB_CONCURRENCY', os.cpu_count() or 1))
+
+# Воркер не импортирует приложение в мастере: движок и пул создаются в каждом процессе
+preload_app = False
+
+# Сколько ждать завершения текущих запросов при остановке и HUP
+graceful_timeout = int(os.getenv('GRACEFUL_TIMEOUT', 30))
+timeout = int(os.getenv('WORKER_TIMEOUT', 60))
+keepalive = int(os.getenv('KEEPALIVE', 5))
+
+# Периодический перезапуск воркеров со случайным сдвигом, чтобы не перезапускались разом
+max_requests = int(os.getenv('MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('MAX_REQUESTS_JITTER', 0))
+
+forwarded_allow_ips = '*'
+accesslog = '-'
@@ -1,10 +1,31 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
-from endpoints import auth, profiles, project, contrib
+from endpoints import admin, auth, profiles, project, contrib, metrics
+from models.base import engine, read_replica, async_session_maker
+from models.stats import run_platform_stats_refresher
+from settings import settings
+from utils.metrics import MetricsMiddleware, instrument_engine
+from utils.pagination import NEXT_CURSOR_HEADER
+from utils.progress_events import progress_broker
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    stats_refresher = asyncio.create_task(run_platform_stats_refresher(async_session_maker, settings.STATS_MAX_STALENESS))
+    yield
+    stats_refresher.cancel()
+    with suppress(asyncio.CancelledError):
+        await stats_refresher
+    await progress_broker.close()
+
 
 app = FastAPI(
     title='Краудфандинговая платформа',
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -12,9 +33,19 @@ app.add_middleware(
     allow_origins=['*'],  # Разрешенные домены
     allow_methods=['*'],  # Разрешенные методы (GET, POST и т. д.)
     allow_headers=['*'],  # Разрешенные заголовки
+    expose_headers=[NEXT_CURSOR_HEADER],  # Курсор следующей страницы
 )
 
+if settings.METRICS_ENABLED:
+    # Последний добавленный middleware - внешний: в замер входит и CORS
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    if read_replica is not None:
+        instrument_engine(read_replica.engine)
+    app.include_router(metrics.metrics_router)
+
 app.include_router(auth.auth_router, prefix='/auth')
 app.include_router(profiles.profile_router, prefix='/profile')
 app.include_router(project.project_router, prefix='/projects')
 app.include_router(contrib.contrib_router, prefix='/contrib')
+app.include_router(admin.admin_router, prefix='/admin')
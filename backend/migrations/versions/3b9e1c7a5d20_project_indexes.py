@@ -0,0 +1,44 @@
+"""project_indexes
+
+Revision ID: 3b9e1c7a5d20
+Revises: 96df300dfaa8
+Create Date: 2026-10-18 10:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e1c7a5d20'
+down_revision: Union[str, Sequence[str], None] = '96df300dfaa8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_projects_status_start_date_id', 'projects', ['status', 'start_date', 'id'], unique=False)
+    op.create_index(
+        'ix_projects_author_id_status_start_date_id',
+        'projects',
+        ['author_id', 'status', 'start_date', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_projects_project_type_status_start_date_id',
+        'projects',
+        ['project_type', 'status', 'start_date', 'id'],
+        unique=False,
+    )
+    op.create_index('ix_rewards_project_id', 'rewards', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rewards_project_id', table_name='rewards')
+    op.drop_index('ix_projects_project_type_status_start_date_id', table_name='projects')
+    op.drop_index('ix_projects_author_id_status_start_date_id', table_name='projects')
+    op.drop_index('ix_projects_status_start_date_id', table_name='projects')
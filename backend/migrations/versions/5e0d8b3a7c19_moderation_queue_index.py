@@ -0,0 +1,34 @@
+"""moderation_queue_index
+
+Revision ID: 5e0d8b3a7c19
+Revises: a19c4e6f0b72
+Create Date: 2026-10-18 15:08:30.551264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0d8b3a7c19'
+down_revision: Union[str, Sequence[str], None] = 'a19c4e6f0b72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_projects_on_moderation_id',
+        'projects',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'onModeration'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_projects_on_moderation_id', table_name='projects', postgresql_where=sa.text("status = 'onModeration'"))
@@ -0,0 +1,33 @@
+"""profile_listing_indexes
+
+Revision ID: 7d2c5e8a9b14
+Revises: e8b3d6f2a451
+Create Date: 2026-10-18 19:42:11.384920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2c5e8a9b14'
+down_revision: Union[str, Sequence[str], None] = 'e8b3d6f2a451'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_profile_login_pattern', 'profile', ['login'], unique=False,
+                    postgresql_ops={'login': 'text_pattern_ops'})
+    op.create_index('ix_profile_author_id', 'profile', ['id'], unique=False, postgresql_where=sa.text('is_author'))
+    op.create_index('ix_profile_admin_id', 'profile', ['id'], unique=False, postgresql_where=sa.text('is_admin'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_profile_admin_id', table_name='profile', postgresql_where=sa.text('is_admin'))
+    op.drop_index('ix_profile_author_id', table_name='profile', postgresql_where=sa.text('is_author'))
+    op.drop_index('ix_profile_login_pattern', table_name='profile')
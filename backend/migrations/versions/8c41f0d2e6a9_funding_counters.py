@@ -0,0 +1,57 @@
+"""funding_counters
+
+Revision ID: 8c41f0d2e6a9
+Revises: 3b9e1c7a5d20
+Create Date: 2026-10-18 11:02:17.640925
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41f0d2e6a9'
+down_revision: Union[str, Sequence[str], None] = '3b9e1c7a5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('raised_amount', sa.Float(), server_default='0', nullable=False))
+    op.add_column('projects', sa.Column('contributions_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('rewards', sa.Column('sold_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Заполнение счетчиков по уже существующим вкладам
+    op.execute(
+        """
+        UPDATE rewards SET sold_count = agg.cnt
+        FROM (
+            SELECT reward_id, count(*) AS cnt
+            FROM contributions
+            GROUP BY reward_id
+        ) AS agg
+        WHERE rewards.id = agg.reward_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE projects SET raised_amount = agg.amount, contributions_count = agg.cnt
+        FROM (
+            SELECT contributions.project_id, sum(rewards.price) AS amount, count(*) AS cnt
+            FROM contributions
+            JOIN rewards ON rewards.id = contributions.reward_id
+            GROUP BY contributions.project_id
+        ) AS agg
+        WHERE projects.id = agg.project_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rewards', 'sold_count')
+    op.drop_column('projects', 'contributions_count')
+    op.drop_column('projects', 'raised_amount')
@@ -0,0 +1,34 @@
+"""revoked_refresh_tokens
+
+Revision ID: b4e91f3c6d27
+Revises: 7d2c5e8a9b14
+Create Date: 2026-10-18 21:05:47.219364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e91f3c6d27'
+down_revision: Union[str, Sequence[str], None] = '7d2c5e8a9b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('revoked_refresh_tokens',
+    sa.Column('jti', sa.String(length=32), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('jti')
+    )
+    op.create_index('ix_revoked_refresh_tokens_expires_at', 'revoked_refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_revoked_refresh_tokens_expires_at', table_name='revoked_refresh_tokens')
+    op.drop_table('revoked_refresh_tokens')
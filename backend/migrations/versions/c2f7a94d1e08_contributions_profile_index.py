@@ -0,0 +1,33 @@
+"""contributions_profile_index
+
+Revision ID: c2f7a94d1e08
+Revises: 5e0d8b3a7c19
+Create Date: 2026-10-18 16:34:12.845610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f7a94d1e08'
+down_revision: Union[str, Sequence[str], None] = '5e0d8b3a7c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_contributions_profile_id_created_at_id',
+        'contributions',
+        ['profile_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contributions_profile_id_created_at_id', table_name='contributions')
@@ -0,0 +1,48 @@
+"""platform_stats
+
+Revision ID: d57a2e9b1f43
+Revises: 8c41f0d2e6a9
+Create Date: 2026-10-18 12:40:05.117302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd57a2e9b1f43'
+down_revision: Union[str, Sequence[str], None] = '8c41f0d2e6a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('platform_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('total_count', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('cool_projects', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Единственная строка снимка, чтобы эндпоинт всегда делал UPDATE, а не INSERT
+    op.execute(
+        """
+        INSERT INTO platform_stats (id, total_count, total_amount, cool_projects, refreshed_at)
+        SELECT
+            1,
+            coalesce(sum(contributions_count), 0),
+            coalesce(sum(raised_amount), 0),
+            count(*) FILTER (WHERE raised_amount >= goal_amount),
+            timezone('utc', now())
+        FROM projects
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('platform_stats')
@@ -0,0 +1,57 @@
+"""project_progress_notify
+
+Revision ID: e8b3d6f2a451
+Revises: c2f7a94d1e08
+Create Date: 2026-10-18 17:52:44.310587
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3d6f2a451'
+down_revision: Union[str, Sequence[str], None] = 'c2f7a94d1e08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NOTIFY уходит подписчикам только после коммита транзакции со вкладом
+    op.execute(
+        """
+        CREATE FUNCTION notify_project_progress() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'project_progress',
+                json_build_object(
+                    'project_id', NEW.id,
+                    'raised_amount', NEW.raised_amount,
+                    'contributions_count', NEW.contributions_count,
+                    'goal_amount', NEW.goal_amount
+                )::text
+            );
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER projects_progress_notify
+        AFTER UPDATE OF raised_amount, contributions_count ON projects
+        FOR EACH ROW
+        WHEN (OLD.raised_amount IS DISTINCT FROM NEW.raised_amount
+              OR OLD.contributions_count IS DISTINCT FROM NEW.contributions_count)
+        EXECUTE FUNCTION notify_project_progress()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER projects_progress_notify ON projects')
+    op.execute('DROP FUNCTION notify_project_progress()')
@@ -2,3 +2,5 @@ from .base import *
 from .contrib import *
 from .profile import *
 from .project import *
+from .stats import *
+from .token import *
@@ -1,20 +1,71 @@
+import os
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.ext.declarative import declarative_base
 
 from settings import settings
+from utils.slow_queries import instrument_slow_queries
+from .pool import TimedQueuePool
+from .replica import ReadReplica
 
 __all__ = [
     'Base',
     'get_db',
+    'get_read_db',
 ]
 
 
 Base = declarative_base()
 
+
+def _connect_args(url: str) -> dict:
+    if url.startswith('postgresql+asyncpg'):
+        return dict(statement_cache_size=settings.DATABASE_STATEMENT_CACHE_SIZE)
+    return {}
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        connect_args=_connect_args(url),
+    )
+    if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+        instrument_slow_queries(new_engine, settings.SLOW_QUERY_THRESHOLD_MS)
+    return new_engine
+
+
+engine = _create_engine(settings.DATABASE_URL)
+
+read_replica = None
+if settings.DATABASE_REPLICA_URL:
+    read_replica = ReadReplica(
+        _create_engine(settings.DATABASE_REPLICA_URL),
+        max_lag=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+        check_interval=settings.DATABASE_REPLICA_CHECK_SECONDS,
+    )
+
+
+def _reset_pool_after_fork():
+    # Соединения родителя нельзя использовать в дочернем процессе: каждый воркер
+    # начинает со своего пустого пула, не закрывая соединения родителя.
+    engine.sync_engine.dispose(close=False)
+    if read_replica is not None:
+        read_replica.reset_after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
 async_session_maker = async_sessionmaker(
-    bind=create_async_engine(settings.DATABASE_URL, echo=True),
+    bind=engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
@@ -22,3 +73,24 @@ async_session_maker = async_sessionmaker(
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия только для чтения: на реплику, если она задана, доступна и не
+    отстает больше DATABASE_REPLICA_MAX_LAG_SECONDS, иначе на мастер.
+    Писать через эту сессию нельзя.
+    """
+    if read_replica is not None and await read_replica.available():
+        async with read_replica.session_maker() as session:
+            try:
+                # Соединение берется сразу, чтобы упавшая реплика не роняла запрос.
+                # SQLAlchemyError покрывает и ошибки драйвера, и исчерпанный пул (TimeoutError)
+                await session.connection()
+            except (SQLAlchemyError, OSError):
+                read_replica.mark_down()
+            else:
+                yield session
+                return
+    async with async_session_maker() as session:
+        yield session
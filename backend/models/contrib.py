@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Index
 from sqlalchemy.orm import mapped_column, relationship
 
 from models import Base
@@ -22,3 +22,8 @@ class Contribution(Base):
     profile = relationship('Profile', back_populates='contributions')
     status = Column(String(50), nullable=False)
     created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # Лента "мои вклады": WHERE profile_id = ? ORDER BY created_at DESC, id DESC
+        Index('ix_contributions_profile_id_created_at_id', profile_id, created_at.desc(), id.desc()),
+    )
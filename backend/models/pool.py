@@ -0,0 +1,59 @@
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+__all__ = [
+    'TimedQueuePool',
+]
+
+
+class _TimedQueue(AsyncAdaptedQueue):
+    """
+    Очередь свободных соединений, которая замеряет блокирующее ожидание в get().
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        if not block:
+            return super().get(block, timeout)
+        started = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            waited = time.perf_counter() - started
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, который замеряет, сколько запросы ждали свободное соединение.
+    Учитывается только ожидание в очереди, открытие нового соединения - нет.
+    """
+    _queue_class = _TimedQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+
+    def connect(self):
+        self.checkouts += 1
+        return super().connect()
+
+    def stats(self) -> dict:
+        return dict(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            # QueuePool считает overflow от -pool_size, наружу - только реально открытые сверх пула
+            overflow=max(self.overflow(), 0),
+            max_overflow=self._max_overflow,
+            checkouts=self.checkouts,
+            wait_total=self._pool.wait_total,
+            wait_max=self._pool.wait_max,
+            wait_avg=self._pool.wait_total / self.checkouts if self.checkouts else 0.0,
+        )
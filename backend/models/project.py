@@ -1,18 +1,38 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Date, Float, Boolean
-from sqlalchemy.orm import mapped_column, relationship
+from sqlalchemy import Column, Integer, ForeignKey, String, Date, Float, Boolean, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import mapped_column, relationship, deferred
 
 from models import Base
 
 __all__ = [
     'Project',
     'Reward',
+    'PROJECT_SEARCH_CONFIGS',
 ]
 
+# Текстовые конфигурации полнотекстового поиска по проектам
+PROJECT_SEARCH_CONFIGS = ('russian', 'english')
+
+PROJECT_SEARCH_VECTOR = ' || '.join(
+    f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')"
+    for column, weight in (('title', 'A'), ('description', 'B'))
+    for config in PROJECT_SEARCH_CONFIGS
+)
+
 class Project(Base):
     """
     Проект
     """
     __tablename__ = 'projects'
+    __table_args__ = (
+        # Индексы под keyset-пагинацию каталога по (status, start_date, id)
+        Index('ix_projects_status_start_date_id', 'status', 'start_date', 'id'),
+        Index('ix_projects_author_id_status_start_date_id', 'author_id', 'status', 'start_date', 'id'),
+        Index('ix_projects_project_type_status_start_date_id', 'project_type', 'status', 'start_date', 'id'),
+        Index('ix_projects_search_vector', 'search_vector', postgresql_using='gin'),
+        # Очередь модерации: маленький частичный индекс только по ожидающим проектам
+        Index('ix_projects_on_moderation_id', 'id', postgresql_where=text("status = 'onModeration'")),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     author_id = mapped_column(ForeignKey('profile.id', ondelete='RESTRICT'), nullable=False)
     author = relationship('Profile', back_populates='projects')
@@ -24,6 +44,11 @@ class Project(Base):
     end_date = Column(Date, nullable=False)
     status = Column(String, nullable=False)
     moderator_comment = Column(String, nullable=True)
+    # Денормализованные счетчики, поддерживаются в make_contribution
+    raised_amount = Column(Float, nullable=False, default=0, server_default='0')
+    contributions_count = Column(Integer, nullable=False, default=0, server_default='0')
+    # Генерируется самой БД, в обычные выборки не попадает
+    search_vector = deferred(Column(TSVECTOR, Computed(PROJECT_SEARCH_VECTOR, persisted=True)))
 
     rewards = relationship('Reward', back_populates='project')
     contributions = relationship('Contribution', back_populates='project')
@@ -33,6 +58,9 @@ class Reward(Base):
     Вознаграждение
     """
     __tablename__ = 'rewards'
+    __table_args__ = (
+        Index('ix_rewards_project_id', 'project_id'),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = mapped_column(ForeignKey('projects.id', ondelete='RESTRICT'), nullable=False)
     project = relationship('Project', back_populates='rewards')
@@ -41,5 +69,6 @@ class Reward(Base):
     price = Column(Float, nullable=False)
     quantity = Column(Integer, nullable=False)
     active = Column(Boolean, nullable=False)
+    sold_count = Column(Integer, nullable=False, default=0, server_default='0')
 
     contributions = relationship('Contribution', back_populates='reward')
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+__all__ = [
+    'ReadReplica',
+]
+
+logger = logging.getLogger(__name__)
+
+# Отставание реплики в секундах; 0, если все полученное WAL уже применено
+# (иначе при простое мастера время последней транзакции растет без отставания)
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReadReplica:
+    """
+    Реплика для читающих эндпоинтов. Отставание проверяется не чаще раза в
+    check_interval секунд, результат общий для всех запросов процесса.
+    Пока реплика отстает больше max_lag или недоступна, чтение идет в мастер.
+    """
+    def __init__(self, engine: AsyncEngine, max_lag: float, check_interval: float, check_timeout: float = 1.0):
+        self.engine = engine
+        self.session_maker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.lag: float | None = None
+        # None - реплика еще не проверялась
+        self._healthy: bool | None = None
+        self._checked_at = float('-inf')
+        self._lock = asyncio.Lock()
+
+    async def available(self) -> bool:
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return bool(self._healthy)
+        async with self._lock:
+            # Пока ждали блокировку, проверку мог выполнить другой запрос
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                await self._check()
+        return bool(self._healthy)
+
+    async def _fetch_lag(self) -> float:
+        async with self.engine.connect() as connection:
+            return float(await connection.scalar(REPLICA_LAG_QUERY))
+
+    async def _check(self):
+        try:
+            self.lag = await asyncio.wait_for(self._fetch_lag(), self.check_timeout)
+        except Exception as exc:
+            if self._healthy is not False:
+                logger.warning('Read replica is unavailable, reading from the primary: %s', exc)
+            self.lag = None
+            self._healthy = False
+        else:
+            healthy = self.lag <= self.max_lag
+            if healthy != self._healthy:
+                logger.warning('Read replica lag is %.1fs, reading from the %s', self.lag,
+                               'replica' if healthy else 'primary')
+            self._healthy = healthy
+        self._checked_at = time.monotonic()
+
+    def mark_down(self):
+        """
+        Реплика не отдала соединение: до следующей проверки чтение идет в мастер.
+        """
+        self._healthy = False
+        self._checked_at = time.monotonic()
+
+    def reset_after_fork(self):
+        self.engine.sync_engine.dispose(close=False)
+        self._lock = asyncio.Lock()
+        self._checked_at = float('-inf')
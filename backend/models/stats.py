@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import Column, Integer, Float, DateTime, select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models.base import Base
+from models.project import Project
+
+__all__ = [
+    'PlatformStats',
+    'refresh_platform_stats',
+    'run_platform_stats_refresher',
+]
+
+logger = logging.getLogger(__name__)
+
+
+class PlatformStats(Base):
+    """
+    Снимок общей статистики платформы. Всегда одна строка с id=1.
+    """
+    __tablename__ = 'platform_stats'
+    id = Column(Integer, primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0)
+    cool_projects = Column(Integer, nullable=False, default=0)
+    # UTC без часового пояса, по часам БД: timezone('utc', now())
+    refreshed_at = Column(DateTime, nullable=False)
+
+
+def _db_utcnow():
+    return func.timezone('utc', func.now())
+
+
+async def refresh_platform_stats(db: AsyncSession, max_age: timedelta) -> bool:
+    """
+    Пересчитывает снимок по денормализованным счетчикам проектов, если он
+    старше max_age. Строка снимка берется FOR UPDATE SKIP LOCKED: из
+    нескольких процессов пересчет делает только один, остальные его пропускают.
+    Возраст считается по часам БД, которыми снимок и записывается.
+    """
+    locked = await db.scalar(
+        select(PlatformStats.id)
+        .where(PlatformStats.id == 1, PlatformStats.refreshed_at < _db_utcnow() - max_age)
+        .with_for_update(skip_locked=True)
+    )
+    if locked is None:
+        await db.rollback()
+        return False
+    total_count, total_amount, cool_projects = (await db.execute(select(
+        func.coalesce(func.sum(Project.contributions_count), 0),
+        func.coalesce(func.sum(Project.raised_amount), 0),
+        func.count(Project.id).filter(Project.raised_amount >= Project.goal_amount),
+    ))).one()
+    await db.execute(
+        update(PlatformStats)
+        .where(PlatformStats.id == 1)
+        .values(total_count=total_count, total_amount=total_amount, cool_projects=cool_projects,
+                refreshed_at=_db_utcnow())
+    )
+    await db.commit()
+    return True
+
+
+async def run_platform_stats_refresher(session_maker: async_sessionmaker, max_staleness: timedelta):
+    """
+    Фоновая задача процесса: поддерживает снимок не старше max_staleness.
+    Проверка идет вдвое чаще, а пересчитывается снимок старше половины срока,
+    так что при любом числе процессов он пересчитывается примерно раз в половину срока.
+    """
+    interval = max_staleness / 2
+    while True:
+        try:
+            async with session_maker() as db:
+                await refresh_platform_stats(db, interval)
+        except Exception:
+            logger.exception('Platform stats refresh failed')
+        await asyncio.sleep(interval.total_seconds())
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, DateTime, Index
+
+from models.base import Base
+
+__all__ = [
+    'RevokedRefreshToken',
+]
+
+
+class RevokedRefreshToken(Base):
+    """
+    Использованный или отозванный refresh токен. Строка нужна только до
+    истечения самого токена, после этого ее можно удалить.
+    """
+    __tablename__ = 'revoked_refresh_tokens'
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('ix_revoked_refresh_tokens_expires_at', expires_at),
+    )
@@ -2,11 +2,14 @@ import datetime
 
 import pydantic
 
-from schemas.project import CreatedProjectData
+from schemas.project import ProjectBriefData
 from schemas.reward import RewardData
 
 __all__ = [
     'ContribSchema',
+    'DetailedContribSchema',
+    'ContribImportItem',
+    'ContribImportResult',
 ]
 
 
@@ -20,5 +23,28 @@ class ContribSchema(pydantic.BaseModel):
 
 
 class DetailedContribSchema(ContribSchema):
-    project: CreatedProjectData
+    project: ProjectBriefData
     reward: RewardData
+
+
+class ContribImportItem(pydantic.BaseModel):
+    project_id: int
+    reward_id: int
+    profile_id: int
+    status: str = pydantic.Field(default='Новый', max_length=50)
+    created_at: datetime.datetime | None = None
+
+    @pydantic.field_validator('created_at')
+    @classmethod
+    def to_naive_local(cls, value: datetime.datetime | None) -> datetime.datetime | None:
+        # Столбец без часового пояса и заполняется datetime.now(): время
+        # с поясом переводится в локальное время сервера
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone().replace(tzinfo=None)
+        return value
+
+
+class ContribImportResult(pydantic.BaseModel):
+    index: int
+    id: int | None = None
+    error: str | None = None
@@ -1,4 +1,5 @@
 from datetime import date
+from enum import Enum
 
 import pydantic
 
@@ -17,3 +18,34 @@ class CreatedProjectData(BaseProjectData):
     author_id: int
     status: str
     moderator_comment: str | None = None
+    raised_amount: float = 0
+    contributions_count: int = 0
+
+
+class ProjectBriefData(pydantic.BaseModel):
+    """
+    Краткие сведения о проекте для списков, без описания.
+    """
+    id: int
+    title: str
+    project_type: str
+    status: str
+    goal_amount: float
+    raised_amount: float = 0
+
+
+class ModerationDecision(str, Enum):
+    accept = 'accept'
+    reject = 'reject'
+    to_draft = 'to_draft'
+
+
+class ModerationDecisionItem(pydantic.BaseModel):
+    project_id: int
+    decision: ModerationDecision
+    message: str
+
+
+class ModerationBatchResult(pydantic.BaseModel):
+    applied: list[CreatedProjectData]
+    skipped: list[int]
@@ -10,3 +10,4 @@ class BaseRewardData(BaseModel):
 class RewardData(BaseRewardData):
     id: int
     active: bool
+    sold_count: int = 0
@@ -1,11 +1,22 @@
+from functools import cached_property
+
 from dotenv import load_dotenv
 
 from .jwt_settings import *
 from .database_settings import *
+from .stats_settings import *
+from .security_settings import *
+from .cache_settings import *
+from .metrics_settings import *
 
 load_dotenv()
 
-class Settings(JWTSettings, DatabaseSettings):
-    pass
+class Settings(JWTSettings, DatabaseSettings, StatsSettings, SecuritySettings, CacheSettings, MetricsSettings):
+    def __init__(self):
+        # Все значения читаются и проверяются один раз при старте,
+        # дальше обращения к settings.* не трогают окружение.
+        for name in dir(type(self)):
+            if isinstance(getattr(type(self), name), cached_property):
+                getattr(self, name)
 
 settings = Settings()
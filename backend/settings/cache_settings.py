@@ -0,0 +1,16 @@
+import os
+from functools import cached_property
+
+__all__ = [
+    'CacheSettings',
+]
+
+
+class CacheSettings:
+    @cached_property
+    def RESPONSE_CACHE_SIZE(self) -> int:
+        return int(os.getenv('RESPONSE_CACHE_SIZE', 10_000))
+
+    @cached_property
+    def RESPONSE_CACHE_TTL_SECONDS(self) -> float:
+        return float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', 30))
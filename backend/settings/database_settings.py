@@ -1,4 +1,7 @@
 import os
+from functools import cached_property
+
+from .utils import required_env, env_bool
 
 __all__ = [
     'DatabaseSettings',
@@ -6,6 +9,56 @@ __all__ = [
 
 
 class DatabaseSettings:
-    @property
+    @cached_property
     def DATABASE_URL(self) -> str:
-        return os.getenv('DATABASE_URL')
+        return required_env('DATABASE_URL')
+
+    @cached_property
+    def DATABASE_ECHO(self) -> bool:
+        return env_bool('DATABASE_ECHO', False)
+
+    @cached_property
+    def DATABASE_POOL_SIZE(self) -> int:
+        return int(os.getenv('DATABASE_POOL_SIZE', 10))
+
+    @cached_property
+    def DATABASE_MAX_OVERFLOW(self) -> int:
+        return int(os.getenv('DATABASE_MAX_OVERFLOW', 10))
+
+    @cached_property
+    def DATABASE_POOL_TIMEOUT(self) -> float:
+        return float(os.getenv('DATABASE_POOL_TIMEOUT', 30))
+
+    @cached_property
+    def DATABASE_POOL_RECYCLE(self) -> int:
+        return int(os.getenv('DATABASE_POOL_RECYCLE', 1800))
+
+    @cached_property
+    def DATABASE_POOL_PRE_PING(self) -> bool:
+        return env_bool('DATABASE_POOL_PRE_PING', True)
+
+    @cached_property
+    def DATABASE_STATEMENT_CACHE_SIZE(self) -> int:
+        return int(os.getenv('DATABASE_STATEMENT_CACHE_SIZE', 100))
+
+    @cached_property
+    def DATABASE_REPLICA_URL(self) -> str | None:
+        # Необязательная реплика для читающих эндпоинтов
+        return os.getenv('DATABASE_REPLICA_URL') or None
+
+    @cached_property
+    def DATABASE_REPLICA_MAX_LAG_SECONDS(self) -> float:
+        return float(os.getenv('DATABASE_REPLICA_MAX_LAG_SECONDS', 5))
+
+    @cached_property
+    def DATABASE_REPLICA_CHECK_SECONDS(self) -> float:
+        return float(os.getenv('DATABASE_REPLICA_CHECK_SECONDS', 5))
+
+    @cached_property
+    def SLOW_QUERY_THRESHOLD_MS(self) -> float:
+        # 0 отключает журнал медленных запросов
+        return float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+
+    @cached_property
+    def SLOW_QUERY_TOP_SIZE(self) -> int:
+        return int(os.getenv('SLOW_QUERY_TOP_SIZE', 500))
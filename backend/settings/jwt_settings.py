@@ -1,4 +1,7 @@
 import os
+from functools import cached_property
+
+from .utils import required_env
 
 __all__ = [
     'JWTSettings',
@@ -8,22 +11,39 @@ from datetime import timedelta
 
 
 class JWTSettings:
-    @property
+    @cached_property
     def ACCESS_TOKEN_SECRET_KEY(self) -> str:
-        return os.getenv('ACCESS_TOKEN_SECRET_KEY')
+        return required_env('ACCESS_TOKEN_SECRET_KEY')
 
-    @property
+    @cached_property
     def REFRESH_TOKEN_SECRET_KEY(self) -> str:
-        return os.getenv('REFRESH_TOKEN_SECRET_KEY')
+        return required_env('REFRESH_TOKEN_SECRET_KEY')
 
-    @property
+    @cached_property
     def JWT_ALGORITHM(self) -> str:
-        return os.getenv('JWT_ALGORITHM')
+        return required_env('JWT_ALGORITHM')
 
-    @property
+    @cached_property
     def ACCESS_TOKEN_EXPIRE_MINUTES(self) -> timedelta:
         return timedelta(minutes=int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', 60)))
 
-    @property
+    @cached_property
     def REFRESH_TOKEN_EXPIRE_MINUTES(self) -> timedelta:
         return timedelta(minutes=int(os.getenv('REFRESH_TOKEN_EXPIRE_MINUTES', 60*60*30)))
+
+    @cached_property
+    def TOKEN_CACHE_SIZE(self) -> int:
+        return int(os.getenv('TOKEN_CACHE_SIZE', 10_000))
+
+    @cached_property
+    def REFRESH_REVOCATION_FILTER_CAPACITY(self) -> int:
+        return int(os.getenv('REFRESH_REVOCATION_FILTER_CAPACITY', 1_000_000))
+
+    @cached_property
+    def REFRESH_REVOCATION_FILTER_ERROR_RATE(self) -> float:
+        return float(os.getenv('REFRESH_REVOCATION_FILTER_ERROR_RATE', 0.001))
+
+    @cached_property
+    def REVOKED_TOKENS_PURGE_EVERY(self) -> int:
+        # Раз в столько ротаций из БД удаляются записи об уже истекших токенах
+        return int(os.getenv('REVOKED_TOKENS_PURGE_EVERY', 1000))
@@ -0,0 +1,13 @@
+from functools import cached_property
+
+from .utils import env_bool
+
+__all__ = [
+    'MetricsSettings',
+]
+
+
+class MetricsSettings:
+    @cached_property
+    def METRICS_ENABLED(self) -> bool:
+        return env_bool('METRICS_ENABLED', True)
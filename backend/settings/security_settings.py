@@ -0,0 +1,12 @@
+import os
+from functools import cached_property
+
+__all__ = [
+    'SecuritySettings',
+]
+
+
+class SecuritySettings:
+    @cached_property
+    def PASSWORD_HASH_WORKERS(self) -> int:
+        return int(os.getenv('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
@@ -0,0 +1,14 @@
+import os
+from functools import cached_property
+
+__all__ = [
+    'StatsSettings',
+]
+
+from datetime import timedelta
+
+
+class StatsSettings:
+    @cached_property
+    def STATS_MAX_STALENESS(self) -> timedelta:
+        return timedelta(seconds=int(os.getenv('STATS_MAX_STALENESS_SECONDS', 60)))
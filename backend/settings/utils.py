@@ -0,0 +1,20 @@
+import os
+
+__all__ = [
+    'required_env',
+    'env_bool',
+]
+
+
+def required_env(name: str) -> str:
+    value = os.getenv(name)
+    if not value:
+        raise RuntimeError(f'Environment variable {name} is not set')
+    return value
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {'1', 'true', 'yes', 'on'}
@@ -0,0 +1,47 @@
+from typing import Any, Iterable, Sequence
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+__all__ = [
+    'schema_columns',
+    'rows_response',
+    'ListSerializer',
+]
+
+
+def schema_columns(model, schema: type[BaseModel]) -> list:
+    """
+    Колонки ORM-модели, совпадающие с полями схемы ответа. Строки такой выборки
+    уже имеют форму схемы, и их можно отдавать без повторной валидации.
+    """
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def rows_response(rows: Iterable[Any], status_code: int = 200, headers: dict | None = None) -> Response:
+    """
+    Быстрый путь для доверенных строк (RowMapping или dict): сразу в JSON через orjson,
+    минуя валидацию response_model и jsonable_encoder.
+    """
+    return Response(
+        content=orjson.dumps([dict(row) for row in rows]),
+        status_code=status_code,
+        media_type='application/json',
+        headers=headers,
+    )
+
+
+class ListSerializer:
+    """
+    Заранее собранный TypeAdapter для списка схем. Для ORM-объектов делает
+    одну валидацию from_attributes и сериализует в Rust, без второго прохода FastAPI.
+    """
+    def __init__(self, schema: type[BaseModel]):
+        self.adapter = TypeAdapter(list[schema])
+
+    def dump_json(self, objects: Sequence[Any]) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(objects, from_attributes=True))
+
+    def response(self, objects: Sequence[Any], headers: dict | None = None) -> Response:
+        return Response(content=self.dump_json(objects), media_type='application/json', headers=headers)
@@ -1,3 +1,5 @@
+import time
+from collections import OrderedDict
 from http import HTTPStatus
 
 import jwt
@@ -15,21 +17,60 @@ from settings import settings
 security = HTTPBearer()
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
+class VerifiedTokenCache:
+    """
+    LRU-кеш уже проверенных access токенов. Запись живет до exp самого токена,
+    так что кеш никогда не вернет payload истекшего токена.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+
+    def get(self, token: str) -> dict | None:
+        payload = self._entries.get(token)
+        if payload is None:
+            return None
+        if payload.get('exp', 0) <= time.time():
+            del self._entries[token]
+            return None
+        self._entries.move_to_end(token)
+        return payload
+
+    def put(self, token: str, payload: dict):
+        if self.maxsize <= 0 or 'exp' not in payload:
+            return
+        self._entries[token] = payload
+        self._entries.move_to_end(token)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+token_cache = VerifiedTokenCache(settings.TOKEN_CACHE_SIZE)
+
+
+async def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
     """
     Функция для проверки JWT-токена. Декодирует токен с помощью SECRET_KEY и ALGORITHM,
-    выкидывая исключения в случае ошибки.
+    выкидывая исключения в случае ошибки. Уже проверенные токены берутся из кеша.
     """
     token = credentials.credentials
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
-        return jwt.decode(token, settings.ACCESS_TOKEN_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = jwt.decode(token, settings.ACCESS_TOKEN_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail='Token expired')
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail='Invalid token')
+    token_cache.put(token, payload)
+    return payload
 
 
-def verify_refresh_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
+async def verify_refresh_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
     """
     Проверка refresh токена
     """
@@ -42,21 +83,21 @@ def verify_refresh_token(credentials: HTTPAuthorizationCredentials = Security(se
         raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail='Invalid refresh token')
 
 
-def verify_author_role(credentials: HTTPAuthorizationCredentials = Security(security)):
-    data = verify_token(credentials)
+async def verify_author_role(credentials: HTTPAuthorizationCredentials = Security(security)):
+    data = await verify_token(credentials)
     if data['is_author'] is True:
         return data
     raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail='Требуется роль автора, но ее нет.')
 
 
-def verify_investor_role(credentials: HTTPAuthorizationCredentials = Security(security)):
-    data = verify_token(credentials)
+async def verify_investor_role(credentials: HTTPAuthorizationCredentials = Security(security)):
+    data = await verify_token(credentials)
     if data['is_investor'] is True:
         return data
     raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail='Требуется роль инвестора, но ее нет.')
 
-def verify_admin_role(credentials: HTTPAuthorizationCredentials = Security(security)):
-    data = verify_token(credentials)
+async def verify_admin_role(credentials: HTTPAuthorizationCredentials = Security(security)):
+    data = await verify_token(credentials)
     if data['is_admin'] is True:
         return data
     raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail='Требуется роль администратора, но ее нет.')
@@ -0,0 +1,253 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = [
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MetricsRegistry',
+    'MetricsMiddleware',
+    'metrics',
+    'instrument_engine',
+    'current_route',
+    'PROMETHEUS_CONTENT_TYPE',
+]
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Метка маршрута для запросов, не попавших ни в один маршрут: иначе любой
+# сканер путей раздувал бы число временных рядов
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = ''
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+
+    def render(self) -> list[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}', *self._samples()]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def set(self, *label_values, value: float):
+        # Для значений, которые уже считаются в другом месте (например, в пуле)
+        self._values[label_values] = value
+
+    def _samples(self) -> list[str]:
+        return [
+            f'{self.name}{_format_labels(self.labels, key)} {_format_value(value)}'
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    type = 'gauge'
+
+    def dec(self, *label_values, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(_Metric):
+    """
+    Гистограмма с фиксированными границами. На наблюдение - один bisect и два
+    сложения; накопительные суммы по корзинам считаются только при выдаче.
+    """
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values):
+        series = self._series.get(label_values)
+        if series is None:
+            # [счетчики корзин (+Inf последней), сумма, количество]
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, key)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Метрики процесса. При запуске нескольких воркеров у каждого свой реестр,
+    Prometheus опрашивает их по отдельности.
+    """
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors = []
+
+        self.requests = self.add(Counter(
+            'http_requests_total', 'Обработанные HTTP-запросы.', ('method', 'route', 'status'),
+        ))
+        self.latency = self.add(Histogram(
+            'http_request_duration_seconds', 'Время обработки HTTP-запроса.', ('method', 'route'),
+        ))
+        self.in_progress = self.add(Gauge(
+            'http_requests_in_progress', 'HTTP-запросы в обработке.', ('method',),
+        ))
+        self.db_statements = self.add(Histogram(
+            'http_request_db_statements', 'SQL-запросов на один HTTP-запрос.', ('method', 'route'),
+            buckets=STATEMENT_BUCKETS,
+        ))
+        self.db_time = self.add(Histogram(
+            'http_request_db_seconds', 'Суммарное время SQL-запросов на один HTTP-запрос.', ('method', 'route'),
+        ))
+
+    def add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, func):
+        """
+        Регистрирует функцию, которая обновляет метрики непосредственно перед выдачей.
+        """
+        self._collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        for collect in self._collectors:
+            collect()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+class _RequestStats:
+    __slots__ = ('scope', 'statements', 'db_time')
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.statements = 0
+        self.db_time = 0.0
+
+    @property
+    def route(self) -> str:
+        return getattr(self.scope.get('route'), 'path', UNMATCHED_ROUTE)
+
+
+_request_stats: ContextVar[_RequestStats | None] = ContextVar('request_stats', default=None)
+
+
+def current_route() -> str | None:
+    """
+    Шаблон маршрута обрабатываемого HTTP-запроса или None вне запроса.
+    """
+    stats = _request_stats.get()
+    return stats.route if stats is not None else None
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware: время, статус и число SQL-запросов на каждый HTTP-запрос.
+    Метка route - шаблон пути маршрута (/projects/{pk}), а не сам путь.
+    """
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        method = scope['method']
+        status_code = 500
+        stats = _RequestStats(scope)
+        token = _request_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        registry.in_progress.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+            registry.in_progress.dec(method)
+            route = stats.route
+            registry.requests.inc(method, route, status_code)
+            registry.latency.observe(elapsed, method, route)
+            registry.db_statements.observe(stats.statements, method, route)
+            registry.db_time.observe(stats.db_time, method, route)
+
+
+def instrument_engine(engine: AsyncEngine):
+    """
+    Подключает к движку события, которые приписывают число SQL-запросов и время
+    в БД текущему HTTP-запросу. Контекст запроса доходит до синхронных событий,
+    потому что SQLAlchemy переносит contextvars в свои greenlet.
+    """
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+        if _request_stats.get() is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+        stats = _request_stats.get()
+        started = getattr(context, '_metrics_started', None)
+        if stats is not None and started is not None:
+            stats.statements += 1
+            stats.db_time += time.perf_counter() - started
@@ -0,0 +1,78 @@
+import base64
+import json
+from datetime import date, datetime
+from http import HTTPStatus
+
+from fastapi import HTTPException, Response
+
+__all__ = [
+    'NEXT_CURSOR_HEADER',
+    'DEFAULT_PAGE_SIZE',
+    'MAX_PAGE_SIZE',
+    'encode_cursor',
+    'decode_cursor',
+    'set_next_cursor',
+]
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Целые ключи страниц - столбцы INTEGER
+CURSOR_INT_RANGE = range(-2 ** 31, 2 ** 31)
+
+
+def _default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'Unsupported cursor value: {value!r}')
+
+
+def encode_cursor(*values) -> str:
+    """
+    Упаковывает значения ключа последней строки страницы в непрозрачный курсор.
+    """
+    raw = json.dumps(values, default=_default, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_value(value, value_type: type):
+    if value_type in (date, datetime):
+        # Даты в курсоре лежат строками ISO 8601; столбцы без часового пояса
+        if not isinstance(value, str):
+            raise ValueError(value)
+        value = value_type.fromisoformat(value)
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            raise ValueError(value)
+        return value
+    # bool - подкласс int, но в ключе страницы его не бывает
+    if type(value) is not value_type:
+        raise ValueError(value)
+    if value_type is int and value not in CURSOR_INT_RANGE or value_type is str and '\x00' in value:
+        raise ValueError(value)
+    return value
+
+
+def decode_cursor(cursor: str, *types: type) -> list:
+    """
+    Распаковывает курсор и приводит значения к типам столбцов ключа
+    (int, str, date, datetime), выкидывая 400 если он поврежден или подделан.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(values)
+        return [_decode_value(value, value_type) for value, value_type in zip(values, types)]
+    except (ValueError, RecursionError):
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor')
+
+
+def set_next_cursor(response: Response, rows: list, limit: int, key) -> list:
+    """
+    Отрезает лишнюю (limit + 1) строку и, если она была, кладет курсор
+    следующей страницы в заголовок ответа.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import logging
+import os
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from settings import settings
+
+__all__ = [
+    'PROGRESS_CHANNEL',
+    'ProgressBroker',
+    'progress_broker',
+]
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_CHANNEL = 'project_progress'
+
+
+class ProgressBroker:
+    """
+    Одно LISTEN-соединение на процесс, раздающее события прогресса проектов
+    подписчикам в памяти. У каждого подписчика очередь на одно событие:
+    медленный клиент не копит отставание, а получает только последнее состояние.
+    Если соединение потеряно или брокер закрывается, подписчики получают
+    None и отписываются: события, пропущенные до переподключения, иначе
+    потерялись бы молча.
+    """
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self._connection: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+
+    async def _ensure_listening(self):
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+            self._connection = await asyncpg.connect(self.dsn)
+            self._connection.add_termination_listener(self._on_termination)
+            await self._connection.add_listener(self.channel, self._on_notify)
+
+    def _on_termination(self, _connection):
+        logger.warning('Progress LISTEN connection closed, it will be reopened by the next subscriber')
+        self._connection = None
+        self._close_subscribers()
+
+    def _close_subscribers(self):
+        subscribers, self._subscribers = self._subscribers, {}
+        for queues in subscribers.values():
+            for queue in queues:
+                self._put_latest(queue, None)
+
+    @staticmethod
+    def _put_latest(queue: asyncio.Queue, event: dict | None):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def _on_notify(self, _connection, _pid, _channel, payload: str):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning('Malformed progress notification: %r', payload)
+            return
+        for queue in self._subscribers.get(event.get('project_id'), ()):
+            self._put_latest(queue, event)
+
+    async def subscribe(self, project_id: int) -> asyncio.Queue:
+        await self._ensure_listening()
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(project_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, project_id: int, queue: asyncio.Queue):
+        queues = self._subscribers.get(project_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[project_id]
+
+    def reset_after_fork(self):
+        # LISTEN-соединение и подписчики принадлежат родительскому процессу
+        self._connection = None
+        self._lock = asyncio.Lock()
+        self._subscribers = {}
+
+    async def close(self):
+        if self._connection is not None and not self._connection.is_closed():
+            self._connection.remove_termination_listener(self._on_termination)
+            await self._connection.close()
+        self._connection = None
+        self._close_subscribers()
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername='postgresql').render_as_string(hide_password=False)
+
+
+progress_broker = ProgressBroker(_asyncpg_dsn(settings.DATABASE_URL), PROGRESS_CHANNEL)
+
+
+os.register_at_fork(after_in_child=progress_broker.reset_after_fork)
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Project
+
+__all__ = [
+    'Transition',
+    'PROJECT_TRANSITIONS',
+    'apply_transition',
+]
+
+
+@dataclass(frozen=True)
+class Transition:
+    """
+    Переход проекта между статусами. target=None означает удаление проекта.
+    """
+    source: frozenset[str]
+    target: str | None
+    author_only: bool
+    error: str
+
+    def compile(self, pk: int, author_id: int | None, values: dict):
+        conditions = [Project.id == pk, Project.status.in_(self.source)]
+        if self.author_only:
+            conditions.append(Project.author_id == author_id)
+        if self.target is None:
+            return delete(Project).where(*conditions).returning(Project.id)
+        return update(Project).where(*conditions).values(status=self.target, **values).returning(Project)
+
+
+PROJECT_TRANSITIONS = {
+    'submit': Transition(
+        source=frozenset({'draft'}),
+        target='onModeration',
+        author_only=True,
+        error='Проект нельзя перевести на модерацию.',
+    ),
+    'accept': Transition(
+        source=frozenset({'onModeration'}),
+        target='accepted',
+        author_only=False,
+        error='Проект нельзя подтвердить, так как он не находится на модерации.',
+    ),
+    'reject': Transition(
+        source=frozenset({'onModeration'}),
+        target='rejected',
+        author_only=False,
+        error='Проекту нельзя отказать, так как он не находится на модерации.',
+    ),
+    'to_draft': Transition(
+        source=frozenset({'onModeration'}),
+        target='draft',
+        author_only=False,
+        error='Проект нельзя отправить на доработку, так как он не находится на модерации.',
+    ),
+    'delete': Transition(
+        source=frozenset({'draft', 'onModeration'}),
+        target=None,
+        author_only=True,
+        error='Проект на данной стадии удалить уже нельзя.',
+    ),
+}
+
+
+async def apply_transition(
+        db: AsyncSession,
+        name: str,
+        pk: int,
+        author_id: int | None = None,
+        **values,
+) -> Project | int:
+    """
+    Выполняет переход одним UPDATE/DELETE ... WHERE status IN (...) RETURNING.
+    Если строка не изменилась, отдельным запросом выясняет причину:
+    404 - проекта нет, 403 - чужой проект, 409 - статус уже другой.
+    """
+    transition = PROJECT_TRANSITIONS[name]
+    result = (await db.execute(transition.compile(pk, author_id, values))).scalar_one_or_none()
+    if result is not None:
+        return result
+
+    project = await db.get(Project, pk)
+    if not project:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail='Проект не найден.')
+    if transition.author_only and project.author_id != author_id:
+        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail='Вы не можете вносить изменения в данный проект.')
+    raise HTTPException(status_code=HTTPStatus.CONFLICT, detail=transition.error)
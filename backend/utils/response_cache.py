@@ -0,0 +1,111 @@
+import hashlib
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Hashable
+
+from fastapi import Request, Response
+
+from settings import settings
+
+__all__ = [
+    'VERSION_STRIPES',
+    'CachedResponse',
+    'ResponseCache',
+    'response_cache',
+    'project_key',
+    'rewards_key',
+]
+
+VERSION_STRIPES = 4096
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+class CachedResponse:
+    def __init__(self, body: bytes, expires_at: float):
+        self.body = body
+        self.expires_at = expires_at
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+    def not_modified(self, request: Request) -> bool:
+        header = request.headers.get('if-none-match')
+        if not header:
+            return False
+        # If-None-Match сравнивается слабо (RFC 9110): W/ не учитывается,
+        # прокси после gzip присылают слабую версию нашего тега
+        tags = {_strip_weak(tag.strip()) for tag in header.split(',')}
+        return '*' in tags or _strip_weak(self.etag) in tags
+
+    def to_response(self, request: Request) -> Response:
+        headers = {'ETag': self.etag, 'Cache-Control': 'no-cache'}
+        if self.not_modified(request):
+            return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+        return Response(content=self.body, media_type='application/json', headers=headers)
+
+
+class ResponseCache:
+    """
+    Кеш готовых JSON-ответов в памяти процесса с TTL и LRU-вытеснением.
+    Записи сбрасываются изменяющими обработчиками через invalidate().
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        # Версии ключей растут при их инвалидации: ответ, посчитанный до нее, в кеш
+        # уже не попадет. Ключи делят VERSION_STRIPES счетчиков по хешу, чтобы память
+        # не росла с числом ключей; запись одного проекта не мешает заполнять остальные.
+        self._versions = [0] * VERSION_STRIPES
+
+    @staticmethod
+    def _stripe(key: Hashable) -> int:
+        return hash(key) % VERSION_STRIPES
+
+    def version(self, key: Hashable) -> int:
+        """
+        Версия ключа; берется до чтения из БД и передается в put().
+        """
+        return self._versions[self._stripe(key)]
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, body: bytes, version: int) -> CachedResponse:
+        entry = CachedResponse(body, time.monotonic() + self.ttl)
+        if self.maxsize <= 0 or version != self.version(key):
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, *keys: Hashable):
+        for key in keys:
+            self._versions[self._stripe(key)] += 1
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._versions = [version + 1 for version in self._versions]
+        self._entries.clear()
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+def project_key(pk: int) -> tuple:
+    return 'project', pk
+
+
+def rewards_key(project_pk: int) -> tuple:
+    return 'rewards', project_pk
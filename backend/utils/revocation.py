@@ -0,0 +1,52 @@
+import hashlib
+import math
+
+from settings import settings
+
+__all__ = [
+    'BloomFilter',
+    'revoked_refresh_tokens',
+]
+
+
+class BloomFilter:
+    """
+    Фильтр Блума по строковым ключам. "Нет" - точно нет, "да" - возможно,
+    с долей ложных срабатываний около error_rate, пока в фильтре не больше
+    capacity ключей. После этого фильтр очищается: он только ускоряет
+    проверку, источник истины - БД.
+    """
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # Двойное хеширование: k позиций из двух 64-битных половин одного дайджеста
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        if self.count >= self.capacity:
+            self.clear()
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def clear(self):
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+
+revoked_refresh_tokens = BloomFilter(
+    settings.REFRESH_REVOCATION_FILTER_CAPACITY,
+    settings.REFRESH_REVOCATION_FILTER_ERROR_RATE,
+)
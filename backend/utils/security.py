@@ -1,3 +1,9 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import (
     datetime,
     timedelta,
@@ -17,6 +23,7 @@ pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 __all__ = [
     'hash_password',
     'verify_password',
+    'password_hash_metrics',
     'TokenFactory',
 ]
 
@@ -28,12 +35,94 @@ class TokenPayload(BaseModel):
     is_admin: bool
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+class PasswordHashMetrics:
+    """
+    Счетчики пула хеширования: сколько задач ждут в очереди, сколько
+    выполняются, сколько завершено и сколько они простояли в очереди.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def submitted(self):
+        with self._lock:
+            self.pending += 1
+
+    def started(self, queue_wait: float):
+        with self._lock:
+            self.pending -= 1
+            self.in_flight += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+
+    def finished(self):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(
+                pending=self.pending,
+                in_flight=self.in_flight,
+                completed=self.completed,
+                queue_wait_total=self.queue_wait_total,
+                queue_wait_max=self.queue_wait_max,
+            )
+
+
+password_hash_metrics = PasswordHashMetrics()
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Пул создается лениво, чтобы каждый процесс получил свои потоки
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix='bcrypt',
+        )
+    return _executor
+
+
+def _reset_executor_after_fork():
+    # Потоки пула не переживают fork
+    global _executor
+    _executor = None
+
+
+os.register_at_fork(after_in_child=_reset_executor_after_fork)
+
+
+async def _run_in_pool(func, *args):
+    submitted_at = time.perf_counter()
+
+    def task():
+        password_hash_metrics.started(time.perf_counter() - submitted_at)
+        try:
+            return func(*args)
+        finally:
+            password_hash_metrics.finished()
+
+    password_hash_metrics.submitted()
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), task)
+
+
+async def hash_password(password: str) -> str:
+    """
+    bcrypt отпускает GIL, поэтому хеширование выполняется в пуле потоков
+    и не блокирует event loop.
+    """
+    return await _run_in_pool(pwd_context.hash, password)
 
 
-def verify_password(plain_password, hashed_password) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password) -> bool:
+    return await _run_in_pool(pwd_context.verify, plain_password, hashed_password)
 
 
 class TokenFactory:
@@ -45,10 +134,10 @@ class TokenFactory:
             is_admin=user.is_admin,
         )
 
-    def _create_token(self, token_payload: TokenPayload, expires_delta: timedelta, secret_key: str) -> str:
+    def _create_token(self, token_payload: TokenPayload, expires_delta: timedelta, secret_key: str, **claims) -> str:
         to_encode = token_payload.model_dump()
         expire = datetime.now() + expires_delta
-        to_encode.update({'exp': expire})
+        to_encode.update({'exp': expire}, **claims)
         return jwt.encode(to_encode, secret_key, algorithm=settings.JWT_ALGORITHM)
 
     def create_access_token(self, user: Profile) -> str:
@@ -59,10 +148,12 @@ class TokenFactory:
         )
 
     def create_refresh_token(self, user: Profile):
+        # jti делает каждый refresh токен одноразовым: при обмене он отзывается
         return self._create_token(
             token_payload=self._get_token_payload(user),
             expires_delta=settings.REFRESH_TOKEN_EXPIRE_MINUTES,
             secret_key=settings.REFRESH_TOKEN_SECRET_KEY,
+            jti=uuid.uuid4().hex,
         )
 
     def create_pair(self, user: Profile) -> tuple[str, str]:
@@ -0,0 +1,125 @@
+import hashlib
+import heapq
+import logging
+import re
+import time
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from settings import settings
+from utils.metrics import current_route
+
+__all__ = [
+    'SlowQueryStats',
+    'fingerprint',
+    'instrument_slow_queries',
+    'slow_query_stats',
+]
+
+logger = logging.getLogger('slow_queries')
+
+# Строки в кавычках и в долларах ($$...$$, $tag$...$tag$) - одним проходом,
+# чтобы кавычка внутри одной не открывала другую
+_STRING = re.compile(r"'(?:[^']|'')*'|\$((?:[A-Za-z_]\w*)?)\$.*?\$\1\$", re.DOTALL)
+# asyncpg-диалект добавляет к параметрам приведение типа: $1::INTEGER, а также
+# $1::VARCHAR(50), $1::NUMERIC(10, 2), $1::TIMESTAMP WITHOUT TIME ZONE, $1::INTEGER[]
+_CAST = (r'::\w+(?:\s+(?:VARYING|PRECISION))?(?:\s*\(\s*\d+(?:\s*,\s*\d+)?\s*\))?'
+         r'(?:\s+WITH(?:OUT)?\s+TIME\s+ZONE)?(?:\[\d*\])*')
+_PLACEHOLDER = re.compile(rf'(?:\$\d+|%\(\w+\)s|\?)(?:{_CAST})?', re.IGNORECASE)
+_NUMBER = re.compile(r'(?<![\w$.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b', re.IGNORECASE)
+_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_ROWS = re.compile(r'\(\?\+\)(?:\s*,\s*\(\?\+\))+')
+_SPACES = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> tuple[str, str]:
+    """
+    Нормализует SQL: литералы и параметры заменяются на ?, списки значений
+    (IN, многострочный VALUES) сворачиваются. Значения параметров в
+    отпечаток не попадают никогда. Возвращает (id отпечатка, нормализованный текст).
+    """
+    normalized = _STRING.sub('?', statement)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = _LIST.sub('(?+)', normalized)
+    normalized = _ROWS.sub('(?+)', normalized)
+    normalized = _SPACES.sub(' ', normalized).strip()
+    return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest(), normalized
+
+
+@dataclass
+class SlowQueryEntry:
+    fingerprint: str
+    statement: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    last_route: str | None = None
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class SlowQueryStats:
+    """
+    Агрегация медленных запросов по отпечатку. Хранится не больше maxsize
+    отпечатков: новый вытесняет отпечаток с наименьшим суммарным временем.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: dict[str, SlowQueryEntry] = {}
+
+    def record(self, key: str, statement: str, duration_ms: float, rows: int | None, route: str | None):
+        entry = self._entries.get(key)
+        if entry is None:
+            if len(self._entries) >= self.maxsize:
+                del self._entries[min(self._entries, key=lambda k: self._entries[k].total_ms)]
+            entry = self._entries[key] = SlowQueryEntry(key, statement)
+        entry.count += 1
+        entry.total_ms += duration_ms
+        entry.max_ms = max(entry.max_ms, duration_ms)
+        entry.rows += max(rows or 0, 0)
+        entry.last_route = route
+
+    def top(self, limit: int, order_by: str = 'total_ms') -> list[dict]:
+        entries = heapq.nlargest(limit, self._entries.values(), key=lambda entry: getattr(entry, order_by))
+        return [dict(asdict(entry), avg_ms=entry.avg_ms) for entry in entries]
+
+    def clear(self):
+        self._entries.clear()
+
+
+slow_query_stats = SlowQueryStats(settings.SLOW_QUERY_TOP_SIZE)
+
+
+def instrument_slow_queries(engine: AsyncEngine, threshold_ms: float, stats: SlowQueryStats = slow_query_stats):
+    """
+    Подключает к движку журнал запросов дольше threshold_ms: в лог пишутся
+    отпечаток, длительность, число строк и маршрут, но не параметры -
+    в них бывают номера счетов и телефоны. Маршрут известен, когда включен
+    MetricsMiddleware.
+    """
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+        context._slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(_conn, cursor, statement, _parameters, context, _executemany):
+        duration_ms = (time.perf_counter() - context._slow_query_started) * 1000
+        if duration_ms < threshold_ms:
+            return
+        key, normalized = fingerprint(statement)
+        rows = cursor.rowcount if cursor.rowcount >= 0 else None
+        route = current_route()
+        stats.record(key, normalized, duration_ms, rows, route)
+        logger.warning(
+            'slow query %.1f ms rows=%s route=%s fingerprint=%s: %s',
+            duration_ms, rows, route or '-', key, normalized,
+        )
@@ -1,5 +1,6 @@
 // src/api/contrib.ts
 import api from './instance';
+import {fetchAllPages} from './pagination';
 import type {GlobalStatsData, DetailedContribSchema} from './types';
 
 export const contribApi = {
@@ -9,10 +10,9 @@ export const contribApi = {
     return response.data;
   },
 
-  // [НОВОЕ] Получить мои вклады
+  // [НОВОЕ] Получить мои вклады (страницы догружаются по курсору)
   async getMyContributions(): Promise<DetailedContribSchema[]> {
-    const response = await api.get<DetailedContribSchema[]>('/contrib/my');
-    return response.data;
+    return fetchAllPages<DetailedContribSchema>('/contrib/my');
   },
   // GET /contrib/{project_pk}/rewards/{reward_pk}/contrib
   async getContributionsByReward(projectId: number, rewardId: number): Promise<ContribSchema[]> {
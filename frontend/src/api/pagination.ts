@@ -0,0 +1,39 @@
+// src/api/pagination.ts
+import api from './instance';
+
+// Заголовок, в котором бэкенд отдает курсор следующей страницы
+const NEXT_CURSOR_HEADER = 'x-next-cursor';
+
+// Размер страницы списков (как DEFAULT_PAGE_SIZE на бэкенде)
+export const PAGE_SIZE = 50;
+// Наибольшая страница, которую отдает бэкенд (MAX_PAGE_SIZE)
+export const MAX_PAGE_SIZE = 500;
+
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null; // null - страниц больше нет
+}
+
+// Одна страница списка; следующая запрашивается по nextCursor
+export async function fetchPage<T>(
+  url: string,
+  params: Record<string, unknown> = {},
+  cursor: string | null = null,
+): Promise<Page<T>> {
+  const response = await api.get<T[]>(url, {params: {...params, cursor: cursor ?? undefined}});
+  const nextCursor = response.headers[NEXT_CURSOR_HEADER] as string | undefined;
+  return {items: response.data, nextCursor: nextCursor || null};
+}
+
+// Все страницы подряд, самыми крупными страницами. Только для заведомо коротких
+// списков, которые нужны целиком (например, итоги по своим вкладам)
+export async function fetchAllPages<T>(url: string, params: Record<string, unknown> = {}): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: Page<T> = await fetchPage<T>(url, {...params, limit: MAX_PAGE_SIZE}, cursor);
+    items.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return items;
+}
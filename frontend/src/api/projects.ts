@@ -1,8 +1,10 @@
 // src/api/projects.ts
 import api from './instance';
+import {fetchPage, PAGE_SIZE, type Page} from './pagination';
 import type {
   CreatedProjectData,
   BaseProjectData,
+  ProjectFilters,
   RewardData,
   BaseRewardData, ContribSchema
 } from './types';
@@ -10,11 +12,14 @@ import type {
 export const projectsApi = {
   // --- ПРОЕКТЫ ---
 
-  // Получить список всех проектов
+  // Получить страницу списка проектов (фильтрует бэкенд, следующая - по nextCursor)
   // GET /projects/
-  async getProjects(): Promise<CreatedProjectData[]> {
-    const response = await api.get<CreatedProjectData[]>('/projects/');
-    return response.data;
+  async getProjects(
+    filters: ProjectFilters = {},
+    cursor: string | null = null,
+    limit: number = PAGE_SIZE,
+  ): Promise<Page<CreatedProjectData>> {
+    return fetchPage<CreatedProjectData>('/projects/', {...filters, limit}, cursor);
   },
 
   // Получить один проект по ID
@@ -83,6 +88,12 @@ export const projectsApi = {
 
   // --- МОДЕРАЦИЯ ---
 
+  // Очередь проектов на модерации (Admin)
+  // GET /projects/moderation
+  async getModerationQueue(cursor: string | null = null): Promise<Page<CreatedProjectData>> {
+    return fetchPage<CreatedProjectData>('/projects/moderation', {limit: PAGE_SIZE}, cursor);
+  },
+
   // POST /projects/{pk}/to_draft?message=...
   async returnToDraft(id: number, message: string): Promise<CreatedProjectData> {
     const response = await api.post<CreatedProjectData>(`/projects/${id}/to_draft`, null, {
@@ -79,6 +79,12 @@ export interface CreatedProjectData extends BaseProjectData {
   moderator_comment?: string | null;
 }
 
+// Фильтры списка проектов, которые применяет бэкенд
+export interface ProjectFilters {
+  status?: ProjectStatus;
+  author_id?: number;
+}
+
 export interface BaseRewardData {
   title: string;
   description: string;
@@ -113,6 +119,16 @@ export interface ContribSchema {
   created_at: string;
 }
 
+// Краткие сведения о проекте во вкладе
+export interface ProjectBriefData {
+  id: number;
+  title: string;
+  project_type: string;
+  status: string;
+  goal_amount: number;
+  raised_amount: number;
+}
+
 // Расширенная схема для списка моих вкладов (с вложенными объектами)
 export interface DetailedContribSchema {
   id: number;
@@ -121,7 +137,7 @@ export interface DetailedContribSchema {
   profile_id: number;
   status: string;
   created_at: string;
-  project: CreatedProjectData;
+  project: ProjectBriefData;
   reward: RewardData;
 }
 
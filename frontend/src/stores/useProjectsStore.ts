@@ -2,7 +2,10 @@
 import {defineStore} from 'pinia';
 import {ref} from 'vue';
 import {projectsApi} from '@/api/projects';
-import type {CreatedProjectData, BaseProjectData, RewardData, BaseRewardData} from '@/api/types';
+import {PAGE_SIZE, type Page} from '@/api/pagination';
+import type {CreatedProjectData, BaseProjectData, ProjectFilters, RewardData, BaseRewardData} from '@/api/types';
+
+type ProjectsPageLoader = (cursor: string | null) => Promise<Page<CreatedProjectData>>;
 
 export const useProjectsStore = defineStore('projects', () => {
   // Список проектов
@@ -12,21 +15,32 @@ export const useProjectsStore = defineStore('projects', () => {
   const currentRewards = ref<RewardData[]>([]);
 
   const isLoading = ref(false);
+  const isLoadingMore = ref(false);
   const error = ref<string | null>(null);
 
+  // Курсор следующей страницы списка; null - загружено все
+  const nextCursor = ref<string | null>(null);
+
   const activeProject = ref<CreatedProjectData | null>(null);
 
   const projectStats = ref<Record<number, number>>({});
 
+  // Загрузчик страниц текущего списка: им догружаются следующие страницы
+  // и тем же запросом список обновляется
+  let loadPage: ProjectsPageLoader = (cursor) => projectsApi.getProjects({}, cursor);
+
   // --- ACTIONS ---
 
-  // 1. Получение проектов
-  async function fetchProjects() {
+  // Первая страница списка; следующие догружает loadMoreProjects
+  async function loadFirstPage(loader: ProjectsPageLoader) {
+    loadPage = loader;
     isLoading.value = true;
     error.value = null;
     try {
       // Пытаемся получить реальные данные
-      const realProjects = await projectsApi.getProjects();
+      const page = await loader(null);
+      const realProjects = page.items;
+      nextCursor.value = page.nextCursor;
 
       // --- MOCK DATA (для разработки интерфейса) ---
       // Предполагаем, что твой user.id = 1.
@@ -100,17 +114,47 @@ export const useProjectsStore = defineStore('projects', () => {
     } catch (err) {
       console.error(err);
       error.value = 'Не удалось загрузить проекты';
+      nextCursor.value = null;
     } finally {
       isLoading.value = false;
     }
   }
 
+  // 1. Получение проектов (фильтрует бэкенд), постранично
+  async function fetchProjects(filters: ProjectFilters = {}, limit: number = PAGE_SIZE) {
+    await loadFirstPage((cursor) => projectsApi.getProjects(filters, cursor, limit));
+  }
+
+  // Очередь модерации (Admin), постранично
+  async function fetchModerationQueue() {
+    await loadFirstPage((cursor) => projectsApi.getModerationQueue(cursor));
+  }
+
+  // Следующая страница текущего списка по курсору ("Показать еще")
+  async function loadMoreProjects() {
+    if (!nextCursor.value || isLoadingMore.value) return;
+    const loader = loadPage;
+    isLoadingMore.value = true;
+    try {
+      const page = await loader(nextCursor.value);
+      // Пока страница грузилась, могли открыть другой список
+      if (loader !== loadPage) return;
+      projects.value.push(...page.items);
+      nextCursor.value = page.nextCursor;
+    } catch (err) {
+      console.error(err);
+      error.value = 'Не удалось загрузить проекты';
+    } finally {
+      isLoadingMore.value = false;
+    }
+  }
+
   // 2. Создание проекта
   async function createProject(data: BaseProjectData) {
     isLoading.value = true;
     try {
       await projectsApi.createProject(data);
-      await fetchProjects(); // Обновляем список
+      await loadFirstPage(loadPage); // Обновляем список
     } catch (err) {
       console.error(err);
       throw err;
@@ -306,9 +350,13 @@ export const useProjectsStore = defineStore('projects', () => {
     projects,
     currentRewards, // State для наград
     isLoading,
+    isLoadingMore,
     error,
+    nextCursor,
     projectStats,
     fetchProjects,
+    fetchModerationQueue,
+    loadMoreProjects,
     createProject,
     updateProject,
     deleteProject,